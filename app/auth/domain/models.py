@@ -1,68 +1,105 @@
 """Auth domain models."""
-from datetime import datetime, UTC
+from typing import Iterable, List
 from uuid import uuid4
-from sqlalchemy import Column, String, Boolean, DateTime, Text, ARRAY
+from sqlalchemy import Column, String, Boolean, DateTime, Text, BigInteger, Index, LargeBinary, func, text
 from sqlalchemy.dialects.postgresql import UUID
-from app.shared.database import Base
+from app.shared.database import Base, uuid7
+from app.shared.security.authorization import ROLE_BITS, PERMISSION_BITS, encode_mask, decode_mask
 
 
-def get_utc_now():
-    """Get current UTC time as timezone-naive datetime (for PostgreSQL TIMESTAMP WITHOUT TIME ZONE)."""
-    return datetime.now(UTC).replace(tzinfo=None)
+# Timestamps are filled in by Postgres. Columns stay TIMESTAMP WITHOUT TIME ZONE
+# holding UTC, matching the naive datetimes the rest of the codebase compares against.
+UTC_NOW = func.timezone("utc", func.now())
 
 
 class User(Base):
     """User aggregate root."""
 
     __tablename__ = "users"
+    # Server-generated timestamps come back via INSERT/UPDATE ... RETURNING
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_users_tenant_email_lower", "tenant_id", text("lower(email)"), unique=True),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    tenant_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    email = Column(String(255), nullable=False, index=True)
+    tenant_id = Column(UUID(as_uuid=True), nullable=False)
+    email = Column(String(255), nullable=False)
     username = Column(String(100), nullable=False)
     password_hash = Column(String(255), nullable=False)
-    roles = Column(ARRAY(String), nullable=False, default=[])
-    permissions = Column(ARRAY(String), nullable=False, default=[])
+    roles_mask = Column(BigInteger, nullable=False, default=0)
+    permissions_mask = Column(BigInteger, nullable=False, default=0)
     department_id = Column(UUID(as_uuid=True), nullable=True)
     last_login_at = Column(DateTime, nullable=True)
-    last_password_change_at = Column(DateTime, nullable=False, default=get_utc_now)
+    last_password_change_at = Column(DateTime, nullable=False, server_default=UTC_NOW)
     mfa_enabled = Column(Boolean, nullable=False, default=False)
     mfa_secret = Column(String(255), nullable=True)
     is_active = Column(Boolean, nullable=False, default=True)
     email_verified = Column(Boolean, nullable=False, default=False)
-    created_at = Column(DateTime, nullable=False, default=get_utc_now)
-    updated_at = Column(DateTime, nullable=False, default=get_utc_now, onupdate=get_utc_now)
+    created_at = Column(DateTime, nullable=False, server_default=UTC_NOW)
+    updated_at = Column(DateTime, nullable=False, server_default=UTC_NOW, onupdate=UTC_NOW)
+
+    @property
+    def roles(self) -> List[str]:
+        """Role names decoded from roles_mask."""
+        return decode_mask(self.roles_mask or 0, ROLE_BITS)
+
+    @roles.setter
+    def roles(self, values: Iterable[str]) -> None:
+        self.roles_mask = encode_mask(values, ROLE_BITS)
+
+    @property
+    def permissions(self) -> List[str]:
+        """Permission names decoded from permissions_mask."""
+        return decode_mask(self.permissions_mask or 0, PERMISSION_BITS)
+
+    @permissions.setter
+    def permissions(self, values: Iterable[str]) -> None:
+        self.permissions_mask = encode_mask(values, PERMISSION_BITS)
 
 
 class RefreshToken(Base):
     """Refresh token entity."""
 
     __tablename__ = "refresh_tokens"
-
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    tenant_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    token_hash = Column(String(255), nullable=False, unique=True)
-    jti = Column(String(255), nullable=False, unique=True)
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_refresh_tokens_tenant_jti", "tenant_id", "jti", unique=True),
+        Index("ix_refresh_tokens_family_tenant", "family_id", "tenant_id"),
+        # Only live tokens are indexed; revoked rows drop out of the working set
+        Index(
+            "ix_refresh_tokens_active",
+            "user_id",
+            "tenant_id",
+            postgresql_where=text("is_revoked = false")
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    tenant_id = Column(UUID(as_uuid=True), nullable=False)
+    token_hash = Column(LargeBinary(32), nullable=False, unique=True)
+    jti = Column(UUID(as_uuid=True), nullable=False)
     parent_token_id = Column(UUID(as_uuid=True), nullable=True)
     family_id = Column(UUID(as_uuid=True), nullable=False)
     device_fingerprint = Column(String(500), nullable=True)
     is_revoked = Column(Boolean, nullable=False, default=False)
     expires_at = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, nullable=False, default=get_utc_now)
+    created_at = Column(DateTime, nullable=False, server_default=UTC_NOW)
 
 
 class PasswordResetToken(Base):
     """Password reset token entity."""
 
     __tablename__ = "password_reset_tokens"
+    __mapper_args__ = {"eager_defaults": True}
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     tenant_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    token = Column(String(255), nullable=False, unique=True, index=True)
+    token_hash = Column(LargeBinary(16), nullable=False, unique=True)
     is_used = Column(Boolean, nullable=False, default=False)
     expires_at = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, nullable=False, default=get_utc_now)
+    created_at = Column(DateTime, nullable=False, server_default=UTC_NOW)
 
 
@@ -1,11 +1,14 @@
 """Auth command and query handlers."""
+import asyncio
 import hashlib
 from datetime import timedelta
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pyotp
 from fastapi import HTTPException, status
 from loguru import logger
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.commands import (
     RegisterUserCommand,
@@ -22,33 +25,73 @@ from app.auth.domain.models import User, RefreshToken
 from app.auth.repository import AuthRepository
 from app.auth.schemas import TokenResponse, UserResponse
 from app.config import settings
-from app.shared.database import get_utc_now
+from app.shared.database import get_utc_now, uuid7_pair
 from app.shared.events.dispatcher import event_dispatcher
-from app.shared.security.authorization import Role, Permission
+from app.shared.security.authorization import (
+    Role,
+    Permission,
+    ROLE_BITS,
+    PERMISSION_BITS,
+    encode_mask,
+    decode_mask
+)
 from app.shared.security.jwt import jwt_handler
+from app.shared.security.jwt_cache import decode_token_cached, evict_token
 from app.shared.security.password import password_handler
+from app.shared.security.totp import verify_totp
+
+# Roles and permissions granted to newly registered users
+_DEFAULT_ROLES = (Role.TENANT_ADMIN,)
+_DEFAULT_PERMISSIONS = (
+    Permission.TASKS_READ,
+    Permission.TASKS_CREATE,
+    Permission.TASKS_UPDATE,
+    Permission.TASKS_DELETE,
+    Permission.TASKS_ASSIGN,
+    Permission.REPORTS_VIEW,
+    Permission.USERS_MANAGE,
+    Permission.TENANT_CONFIGURE
+)
+_DEFAULT_ROLES_MASK = encode_mask(_DEFAULT_ROLES, ROLE_BITS)
+_DEFAULT_PERMISSIONS_MASK = encode_mask(_DEFAULT_PERMISSIONS, PERMISSION_BITS)
+
+# Token lifetimes, fixed for the life of the process
+_REFRESH_TOKEN_TTL = timedelta(days=settings.refresh_token_expire_days)
+_ACCESS_TOKEN_TTL_SECONDS = settings.access_token_expire_minutes * 60
+_PASSWORD_RESET_TOKEN_TTL = timedelta(hours=1)
+
+# BLAKE2b key for stored refresh/reset token digests (max key size is 64 bytes,
+# so the configured pepper is condensed to 32 bytes first).
+_TOKEN_HASH_KEY = hashlib.blake2b(
+    (settings.token_hash_pepper or settings.secret_key).encode(),
+    digest_size=32
+).digest()
+
+
+def _normalize_email(email: str) -> str:
+    """Return the stored form of an email address (trimmed, lowercased)."""
+    return email.strip().lower()
+
+
+def _hash_refresh_token(token: str) -> bytes:
+    """Return the 32-byte keyed BLAKE2b digest stored in RefreshToken.token_hash."""
+    return hashlib.blake2b(token.encode(), digest_size=32, key=_TOKEN_HASH_KEY).digest()
+
+
+def _hash_reset_token(token: str) -> bytes:
+    """Return the 16-byte keyed BLAKE2b digest stored in PasswordResetToken.token_hash."""
+    return hashlib.blake2b(token.encode(), digest_size=16, key=_TOKEN_HASH_KEY).digest()
 
 
 class RegisterUserHandler:
     """Handler for user registration."""
 
-    def __init__(self, repository: AuthRepository) -> None:
-        """Initialize handler."""
-        self.repository = repository
-
-    async def handle(self, command: RegisterUserCommand) -> UserResponse:
+    async def handle(self, command: RegisterUserCommand, db: AsyncSession) -> UserResponse:
         """Handle user registration."""
-        # Check if user already exists
-        existing_user = await self.repository.get_user_by_email(
-            command.email,
-            command.tenant_id
-        )
+        repository = AuthRepository(db)
 
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="User with this email already exists"
-            )
+        # Emails are stored normalized so lookups hit the functional index
+        email = _normalize_email(command.email)
 
         # Check if password is compromised
         is_compromised = await password_handler.check_compromised_password(command.password)
@@ -58,25 +101,26 @@ class RegisterUserHandler:
                 detail="This password has been compromised in a data breach. Please choose a different password."
             )
 
-        # Hash password
-        password_hash = password_handler.hash_password(command.password)
+        # Hash password off the event loop (CPU-bound)
+        password_hash = await password_handler.hash_password_async(command.password)
 
         # Create user with default role and permissions
         user = User(
             tenant_id=command.tenant_id,
-            email=command.email,
+            email=email,
             username=command.username,
             password_hash=password_hash,
-            roles=[Role.TENANT_ADMIN],
-            permissions=[Permission.TASKS_READ, Permission.TASKS_CREATE,
-    Permission.TASKS_UPDATE,
-    Permission.TASKS_DELETE,
-    Permission.TASKS_ASSIGN,
-    Permission.REPORTS_VIEW,
-    Permission.USERS_MANAGE,
-    Permission.TENANT_CONFIGURE])
+            roles_mask=_DEFAULT_ROLES_MASK,
+            permissions_mask=_DEFAULT_PERMISSIONS_MASK)
 
-        user = await self.repository.create_user(user)
+        # Duplicate emails are rejected by the (tenant_id, lower(email)) unique index
+        try:
+            user = await repository.create_user(user)
+        except IntegrityError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User with this email already exists"
+            )
 
         # Emit event
         event = UserRegistered(
@@ -84,24 +128,25 @@ class RegisterUserHandler:
             tenant_id=user.tenant_id,
             payload={"email": user.email, "username": user.username}
         )
-        await event_dispatcher.dispatch(event)
+        event_dispatcher.dispatch_background(event)
 
         logger.info("User registered", user_id=str(user.id), tenant_id=str(user.tenant_id))
 
-        return UserResponse.model_validate(user)
+        return UserResponse.from_user(user)
 
 
 class LoginHandler:
     """Handler for user login."""
 
-    def __init__(self, repository: AuthRepository) -> None:
-        """Initialize handler."""
-        self.repository = repository
-
-    async def handle(self, command: LoginCommand) -> TokenResponse:
+    async def handle(self, command: LoginCommand, db: AsyncSession) -> TokenResponse:
         """Handle user login."""
+        repository = AuthRepository(db)
+
         # Get user
-        user = await self.repository.get_user_by_email(command.email, command.tenant_id)
+        user = await repository.get_user_for_login(
+            _normalize_email(command.email),
+            command.tenant_id
+        )
 
         if not user:
             logger.warning("Login failed: User not found", tenant_id=str(command.tenant_id))
@@ -118,7 +163,7 @@ class LoginHandler:
             )
 
         # Verify password
-        password_valid = password_handler.verify_password(command.password, user.password_hash)
+        password_valid = await password_handler.verify_password_async(command.password, user.password_hash)
 
         if not password_valid:
             logger.warning("Login failed: Invalid password", user_id=str(user.id), tenant_id=str(user.tenant_id))
@@ -127,6 +172,10 @@ class LoginHandler:
                 detail="Invalid credentials"
             )
 
+        # Upgrade hashes produced with older Argon2 parameters
+        if password_handler.needs_rehash(user.password_hash):
+            user.password_hash = await password_handler.hash_password_async(command.password)
+
         # Check MFA if enabled
         if user.mfa_enabled:
             if not command.mfa_code:
@@ -135,26 +184,14 @@ class LoginHandler:
                     detail="MFA code required"
                 )
 
-            totp = pyotp.TOTP(user.mfa_secret)
-            if not totp.verify(command.mfa_code, valid_window=1):
+            if not verify_totp(user.mfa_secret, command.mfa_code, window=1):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid MFA code"
                 )
 
-        # Create tokens
-        access_token = jwt_handler.create_access_token(
-            user_id=user.id,
-            email=user.email,
-            tenant_id=user.tenant_id,
-            roles=user.roles,
-            permissions=user.permissions,
-            department_id=user.department_id
-        )
-
         # Create refresh token
-        jti = str(uuid4())
-        family_id = uuid4()
+        jti, family_id = uuid7_pair()
         refresh_token_str = jwt_handler.create_refresh_token(
             user_id=user.id,
             tenant_id=user.tenant_id,
@@ -162,7 +199,7 @@ class LoginHandler:
         )
 
         # Store refresh token
-        token_hash = hashlib.sha256(refresh_token_str.encode()).hexdigest()
+        token_hash = _hash_refresh_token(refresh_token_str)
         refresh_token = RefreshToken(
             user_id=user.id,
             tenant_id=user.tenant_id,
@@ -170,13 +207,23 @@ class LoginHandler:
             jti=jti,
             family_id=family_id,
             device_fingerprint=command.device_fingerprint,
-            expires_at=get_utc_now() + timedelta(days=settings.refresh_token_expire_days)
+            expires_at=get_utc_now() + _REFRESH_TOKEN_TTL
         )
-        await self.repository.create_refresh_token(refresh_token)
-
-        # Update last login
         user.last_login_at = get_utc_now()
-        await self.repository.update_user(user)
+
+        # Sign the access token in a worker thread while the login commit is in flight
+        access_token, _ = await asyncio.gather(
+            asyncio.to_thread(
+                jwt_handler.create_access_token,
+                user_id=user.id,
+                email=user.email,
+                tenant_id=user.tenant_id,
+                roles=user.roles,
+                permissions=user.permissions,
+                department_id=user.department_id
+            ),
+            repository.record_login(user, refresh_token)
+        )
 
         # Emit event
         event = UserLoggedIn(
@@ -184,118 +231,95 @@ class LoginHandler:
             tenant_id=user.tenant_id,
             payload={"email": user.email}
         )
-        await event_dispatcher.dispatch(event)
+        event_dispatcher.dispatch_background(event)
 
         logger.info("User logged in", user_id=str(user.id), tenant_id=str(user.tenant_id))
 
-        return TokenResponse(
+        # Trusted, freshly minted values; skip field validation
+        return TokenResponse.model_construct(
             access_token=access_token,
             refresh_token=refresh_token_str,
-            expires_in=settings.access_token_expire_minutes * 60
+            expires_in=_ACCESS_TOKEN_TTL_SECONDS
         )
 
 
 class RefreshTokenHandler:
     """Handler for token refresh."""
 
-    def __init__(self, repository: AuthRepository) -> None:
-        """Initialize handler."""
-        self.repository = repository
-
-    async def handle(self, command: RefreshTokenCommand) -> TokenResponse:
+    async def handle(self, command: RefreshTokenCommand, db: AsyncSession) -> TokenResponse:
         """Handle token refresh."""
+        repository = AuthRepository(db)
+
         # Decode refresh token
         try:
-            payload = jwt_handler.decode_token(command.refresh_token)
+            payload = decode_token_cached(command.refresh_token)
+            jti = UUID(payload["jti"])
+            tenant_id = UUID(payload["tenant_id"])
         except Exception:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid refresh token"
             )
 
-        # Get stored refresh token
-        stored_token = await self.repository.get_refresh_token_by_jti(
-            payload["jti"],
-            payload["tenant_id"]
+        # Mint the successor up front so rotation is a single statement
+        new_id, new_jti = uuid7_pair()
+        new_refresh_token = jwt_handler.create_refresh_token(
+            user_id=payload["sub"],
+            tenant_id=tenant_id,
+            jti=new_jti
         )
 
-        if not stored_token or stored_token.is_revoked:
-            # Token reuse detected - revoke entire family
-            if stored_token:
-                await self.repository.revoke_token_family(
-                    stored_token.family_id,
-                    stored_token.tenant_id
-                )
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid refresh token"
-            )
-
-        # Get user
-        user = await self.repository.get_user_by_id(
-            stored_token.user_id,
-            stored_token.tenant_id
+        rotated = await repository.rotate_refresh_token(
+            jti=jti,
+            tenant_id=tenant_id,
+            new_id=new_id,
+            new_jti=new_jti,
+            token_hash=_hash_refresh_token(new_refresh_token),
+            expires_at=get_utc_now() + _REFRESH_TOKEN_TTL
         )
+        evict_token(command.refresh_token)
 
-        if not user or not user.is_active:
+        if rotated is None:
+            # Token reuse detected - revoke entire family (single statement)
+            was_revoked = await repository.revoke_family_if_reused(jti, tenant_id)
+            if was_revoked is False:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User not found or inactive"
+                )
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found or inactive"
+                detail="Invalid refresh token"
             )
 
-        # Revoke old refresh token
-        await self.repository.revoke_refresh_token(payload["jti"], payload["tenant_id"])
-
-        # Create new tokens
+        # Create new access token
         access_token = jwt_handler.create_access_token(
-            user_id=user.id,
-            email=user.email,
-            tenant_id=user.tenant_id,
-            roles=user.roles,
-            permissions=user.permissions,
-            department_id=user.department_id
-        )
-
-        # Create new refresh token
-        new_jti = str(uuid4())
-        new_refresh_token = jwt_handler.create_refresh_token(
-            user_id=user.id,
-            tenant_id=user.tenant_id,
-            jti=new_jti
+            user_id=rotated.user_id,
+            email=rotated.email,
+            tenant_id=tenant_id,
+            roles=decode_mask(rotated.roles_mask, ROLE_BITS),
+            permissions=decode_mask(rotated.permissions_mask, PERMISSION_BITS),
+            department_id=rotated.department_id
         )
 
-        # Store new refresh token
-        token_hash = hashlib.sha256(new_refresh_token.encode()).hexdigest()
-        refresh_token = RefreshToken(
-            user_id=user.id,
-            tenant_id=user.tenant_id,
-            token_hash=token_hash,
-            jti=new_jti,
-            parent_token_id=stored_token.id,
-            family_id=stored_token.family_id,
-            device_fingerprint=stored_token.device_fingerprint,
-            expires_at=get_utc_now() + timedelta(days=settings.refresh_token_expire_days)
-        )
-        await self.repository.create_refresh_token(refresh_token)
-
-        return TokenResponse(
+        # Trusted, freshly minted values; skip field validation
+        return TokenResponse.model_construct(
             access_token=access_token,
             refresh_token=new_refresh_token,
-            expires_in=settings.access_token_expire_minutes * 60
+            expires_in=_ACCESS_TOKEN_TTL_SECONDS
         )
 
 class LogoutHandler:
     """Handler for user logout."""
 
-    def __init__(self, repository: AuthRepository) -> None:
-        """Initialize handler."""
-        self.repository = repository
-
-    async def handle(self, command: LogoutCommand) -> None:
+    async def handle(self, command: LogoutCommand, db: AsyncSession) -> None:
         """Handle user logout by revoking refresh token."""
+        repository = AuthRepository(db)
+
         # Decode refresh token to get jti
         try:
-            payload = jwt_handler.decode_token(command.refresh_token)
+            payload = decode_token_cached(command.refresh_token)
+            jti = UUID(payload["jti"])
         except Exception:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -303,22 +327,24 @@ class LogoutHandler:
             )
 
         # Revoke the refresh token
-        await self.repository.revoke_refresh_token(payload["jti"], command.tenant_id)
+        revoked = await repository.revoke_refresh_token(jti, command.tenant_id)
+        evict_token(command.refresh_token)
 
-        logger.info("User logged out, token revoked", jti=payload['jti'], tenant_id=str(command.tenant_id))
+        if revoked:
+            logger.info("User logged out, token revoked", jti=str(jti), tenant_id=str(command.tenant_id))
+        else:
+            logger.info("Logout for unknown or already revoked token", jti=str(jti), tenant_id=str(command.tenant_id))
 
 
 class EnableMFAHandler:
     """Handler for enabling MFA."""
 
-    def __init__(self, repository: AuthRepository) -> None:
-        """Initialize handler."""
-        self.repository = repository
-
-    async def handle(self, command: EnableMFACommand) -> dict:
+    async def handle(self, command: EnableMFACommand, db: AsyncSession) -> dict:
         """Handle MFA enable request."""
+        repository = AuthRepository(db)
+
         # Get user
-        user = await self.repository.get_user_by_id(command.user_id, command.tenant_id)
+        user = await repository.get_user_by_id(command.user_id, command.tenant_id)
 
         if not user:
             raise HTTPException(
@@ -338,7 +364,7 @@ class EnableMFAHandler:
 
         # Store secret temporarily (user must verify before it's activated)
         user.mfa_secret = secret
-        user = await self.repository.update_user(user)
+        user = await repository.update_user(user)
 
         logger.info(
             "MFA secret stored",
@@ -364,14 +390,12 @@ class EnableMFAHandler:
 class VerifyMFAHandler:
     """Handler for verifying MFA setup."""
 
-    def __init__(self, repository: AuthRepository) -> None:
-        """Initialize handler."""
-        self.repository = repository
-
-    async def handle(self, command: VerifyMFACommand) -> dict:
+    async def handle(self, command: VerifyMFACommand, db: AsyncSession) -> dict:
         """Handle MFA verification."""
+        repository = AuthRepository(db)
+
         # Get user
-        user = await self.repository.get_user_by_id(command.user_id, command.tenant_id)
+        user = await repository.get_user_by_id(command.user_id, command.tenant_id)
 
         if not user:
             raise HTTPException(
@@ -385,9 +409,8 @@ class VerifyMFAHandler:
                 detail="MFA not set up. Please enable MFA first."
             )
 
-        # Verify the code
-        totp = pyotp.TOTP(user.mfa_secret)
-        if not totp.verify(command.code):
+        # Verify the code (current interval only, as during setup)
+        if not verify_totp(user.mfa_secret, command.code, window=0):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid MFA code"
@@ -395,7 +418,7 @@ class VerifyMFAHandler:
 
         # Enable MFA
         user.mfa_enabled = True
-        await self.repository.update_user(user)
+        await repository.update_user(user)
 
         logger.info("MFA enabled successfully", user_id=str(user.id))
 
@@ -405,28 +428,29 @@ class VerifyMFAHandler:
 class RequestPasswordResetHandler:
     """Handler for requesting password reset."""
 
-    def __init__(self, repository: AuthRepository) -> None:
-        """Initialize handler."""
-        self.repository = repository
-
-    async def handle(self, command: RequestPasswordResetCommand) -> dict:
+    async def handle(self, command: RequestPasswordResetCommand, db: AsyncSession) -> dict:
         """Handle password reset request."""
-        # Get user (don't reveal if user exists for security)
-        user = await self.repository.get_user_by_email(command.email, command.tenant_id)
+        repository = AuthRepository(db)
+
+        # Look up user (don't reveal if user exists for security)
+        user_id = await repository.get_user_id_by_email(
+            _normalize_email(command.email),
+            command.tenant_id
+        )
 
-        if user:
+        if user_id:
             # Generate reset token
             reset_token = str(uuid4())
 
             # Store reset token (in production, send via email)
-            await self.repository.store_password_reset_token(
-                user_id=user.id,
-                tenant_id=user.tenant_id,
-                token=reset_token,
-                expires_at=get_utc_now() + timedelta(hours=1)
+            await repository.store_password_reset_token(
+                user_id=user_id,
+                tenant_id=command.tenant_id,
+                token_hash=_hash_reset_token(reset_token),
+                expires_at=get_utc_now() + _PASSWORD_RESET_TOKEN_TTL
             )
 
-            logger.info("Password reset requested", user_id=str(user.id))
+            logger.info("Password reset requested", user_id=str(user_id))
             # In production: send email with reset link
 
         # Always return success to prevent user enumeration
@@ -436,14 +460,13 @@ class RequestPasswordResetHandler:
 class ResetPasswordHandler:
     """Handler for resetting password."""
 
-    def __init__(self, repository: AuthRepository) -> None:
-        """Initialize handler."""
-        self.repository = repository
-
-    async def handle(self, command: ResetPasswordCommand) -> dict:
+    async def handle(self, command: ResetPasswordCommand, db: AsyncSession) -> dict:
         """Handle password reset."""
+        repository = AuthRepository(db)
+
         # Verify reset token
-        reset_data = await self.repository.get_password_reset_token(command.token)
+        token_hash = _hash_reset_token(command.token)
+        reset_data = await repository.get_password_reset_token(token_hash)
 
         if not reset_data:
             raise HTTPException(
@@ -459,27 +482,18 @@ class ResetPasswordHandler:
                 detail="This password has been compromised in a data breach. Please choose a different password."
             )
 
-        # Get user
-        user = await self.repository.get_user_by_id(reset_data["user_id"], reset_data["tenant_id"])
+        password_hash = await password_handler.hash_password_async(command.new_password)
 
-        if not user:
+        # Claim the token, update the password and revoke all refresh tokens
+        # atomically so concurrent requests cannot both use it
+        user_id = await repository.complete_password_reset(token_hash, password_hash)
+        if user_id is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid reset token"
+                detail="Invalid or expired reset token"
             )
 
-        # Update password
-        user.password_hash = password_handler.hash_password(command.new_password)
-        user.last_password_change_at = get_utc_now()
-        await self.repository.update_user(user)
-
-        # Invalidate reset token
-        await self.repository.invalidate_password_reset_token(command.token)
-
-        # Revoke all refresh tokens for security
-        await self.repository.revoke_all_user_tokens(user.id, user.tenant_id)
-
-        logger.info("Password reset completed", user_id=str(user.id))
+        logger.info("Password reset completed", user_id=str(user_id))
 
         return {"message": "Password reset successfully"}
 
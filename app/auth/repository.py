@@ -1,17 +1,114 @@
 """Auth repository for data access."""
 from typing import Optional
 from uuid import UUID
-from datetime import datetime
-from sqlalchemy import select
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, delete, func, text, bindparam, DateTime, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.auth.domain.models import User, RefreshToken, PasswordResetToken
 from app.shared.database import get_utc_now
 from loguru import logger
 
 
+# Refresh-token rotation in one round-trip: revoke the presented token (only if
+# it is live and its user is active), insert its successor in the same family,
+# and return the user columns needed to mint the access token.
+ROTATE_REFRESH_TOKEN_SQL = text("""
+    WITH old AS (
+        UPDATE refresh_tokens AS rt
+        SET is_revoked = true
+        FROM users AS u
+        WHERE rt.tenant_id = :tenant_id
+          AND rt.jti = :jti
+          AND rt.is_revoked = false
+          AND u.id = rt.user_id
+          AND u.tenant_id = rt.tenant_id
+          AND u.is_active
+        RETURNING rt.id, rt.user_id, rt.family_id, rt.device_fingerprint,
+                  u.email, u.roles_mask, u.permissions_mask, u.department_id
+    ), new AS (
+        INSERT INTO refresh_tokens (
+            id, user_id, tenant_id, token_hash, jti, parent_token_id,
+            family_id, device_fingerprint, is_revoked, expires_at
+        )
+        SELECT :new_id, old.user_id, :tenant_id, :token_hash, :new_jti, old.id,
+               old.family_id, old.device_fingerprint, false, :expires_at
+        FROM old
+    )
+    SELECT user_id, email, roles_mask, permissions_mask, department_id FROM old
+""").bindparams(
+    bindparam("tenant_id", type_=PG_UUID(as_uuid=True)),
+    bindparam("jti", type_=PG_UUID(as_uuid=True)),
+    bindparam("new_id", type_=PG_UUID(as_uuid=True)),
+    bindparam("new_jti", type_=PG_UUID(as_uuid=True)),
+    bindparam("token_hash", type_=LargeBinary),
+    bindparam("expires_at", type_=DateTime)
+)
+
+# Reuse detection for a refresh token that could not be rotated: if the
+# presented token was already revoked, revoke the rest of its family in the
+# same statement. Returns the presented token's revoked flag (no row if unknown).
+REVOKE_REUSED_TOKEN_FAMILY_SQL = text("""
+    WITH presented AS (
+        SELECT family_id, is_revoked
+        FROM refresh_tokens
+        WHERE tenant_id = :tenant_id AND jti = :jti
+    ), family AS (
+        UPDATE refresh_tokens AS rt
+        SET is_revoked = true
+        FROM presented
+        WHERE presented.is_revoked
+          AND rt.family_id = presented.family_id
+          AND rt.tenant_id = :tenant_id
+          AND rt.is_revoked = false
+    )
+    SELECT is_revoked FROM presented
+""").bindparams(
+    bindparam("tenant_id", type_=PG_UUID(as_uuid=True)),
+    bindparam("jti", type_=PG_UUID(as_uuid=True))
+)
+
+# Password reset completion in one round-trip: claim the reset token (only if
+# unused and unexpired), set the user's new password hash and revoke all of the
+# user's live refresh tokens. Returns the user id (no row if the claim failed).
+COMPLETE_PASSWORD_RESET_SQL = text("""
+    WITH claimed AS (
+        UPDATE password_reset_tokens
+        SET is_used = true
+        WHERE token_hash = :token_hash
+          AND is_used = false
+          AND expires_at > timezone('utc', now())
+        RETURNING user_id, tenant_id
+    ), updated AS (
+        UPDATE users AS u
+        SET password_hash = :password_hash,
+            last_password_change_at = timezone('utc', now()),
+            updated_at = timezone('utc', now())
+        FROM claimed
+        WHERE u.id = claimed.user_id
+          AND u.tenant_id = claimed.tenant_id
+        RETURNING u.id, u.tenant_id
+    ), revoked AS (
+        UPDATE refresh_tokens AS rt
+        SET is_revoked = true
+        FROM updated
+        WHERE rt.user_id = updated.id
+          AND rt.tenant_id = updated.tenant_id
+          AND rt.is_revoked = false
+    )
+    SELECT id FROM updated
+""").bindparams(bindparam("token_hash", type_=LargeBinary))
+
+
 class AuthRepository:
     """Repository for auth data access."""
 
+    # Built by the handlers on every request; keep construction to one slot
+    __slots__ = ("session",)
+
     def __init__(self, session: AsyncSession) -> None:
         """Initialize repository."""
         self.session = session
@@ -27,11 +124,43 @@ class AuthRepository:
         return result.scalar_one_or_none()
 
     async def get_user_by_email(self, email: str, tenant_id: UUID) -> Optional[User]:
-        """Get user by email."""
+        """Get user by email (case-insensitive, matches ix_users_tenant_email_lower)."""
         result = await self.session.execute(
             select(User).where(
-                User.email == email,
-                User.tenant_id == tenant_id
+                User.tenant_id == tenant_id,
+                func.lower(User.email) == email.lower()
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_user_id_by_email(self, email: str, tenant_id: UUID) -> Optional[UUID]:
+        """Get only the user's ID by email, without hydrating a User."""
+        return await self.session.scalar(
+            select(User.id).where(
+                User.tenant_id == tenant_id,
+                func.lower(User.email) == email.lower()
+            )
+        )
+
+    async def get_user_for_login(self, email: str, tenant_id: UUID) -> Optional[User]:
+        """Get user by email, loading only the columns the login flow reads."""
+        result = await self.session.execute(
+            select(User)
+            .options(load_only(
+                User.id,
+                User.tenant_id,
+                User.email,
+                User.password_hash,
+                User.roles_mask,
+                User.permissions_mask,
+                User.department_id,
+                User.mfa_enabled,
+                User.mfa_secret,
+                User.is_active
+            ))
+            .where(
+                User.tenant_id == tenant_id,
+                func.lower(User.email) == email.lower()
             )
         )
         return result.scalar_one_or_none()
@@ -39,125 +168,153 @@ class AuthRepository:
     async def create_user(self, user: User) -> User:
         """Create new user."""
         self.session.add(user)
-        await self.session.commit()
-        await self.session.refresh(user)
-        logger.info(f"User created: {user.id}")
+        try:
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            raise
+        logger.info("User created: {}", user.id)
         return user
 
     async def update_user(self, user: User) -> User:
         """Update user."""
         await self.session.commit()
-        await self.session.refresh(user)
-        logger.info(f"User updated: {user.id}")
+        logger.info("User updated: {}", user.id)
         return user
 
-    async def create_refresh_token(self, refresh_token: RefreshToken) -> RefreshToken:
-        """Create refresh token."""
+    async def record_login(self, user: User, refresh_token: RefreshToken) -> None:
+        """Persist a new refresh token and the user's login timestamp in one commit."""
         self.session.add(refresh_token)
         await self.session.commit()
-        await self.session.refresh(refresh_token)
-        return refresh_token
+        logger.info("Login recorded: {}", user.id)
+
+    async def rotate_refresh_token(
+        self,
+        jti: UUID,
+        tenant_id: UUID,
+        new_id: UUID,
+        new_jti: UUID,
+        token_hash: bytes,
+        expires_at: datetime
+    ) -> Optional[Row]:
+        """
+        Atomically revoke a refresh token and insert its successor.
 
-    async def get_refresh_token_by_jti(self, jti: str, tenant_id: UUID) -> Optional[RefreshToken]:
-        """Get refresh token by JTI."""
+        Returns the owning user's id, email, role/permission masks and
+        department, or None if the token is unknown, already revoked, or
+        belongs to an inactive user.
+        """
         result = await self.session.execute(
-            select(RefreshToken).where(
-                RefreshToken.jti == jti,
-                RefreshToken.tenant_id == tenant_id
-            )
+            ROTATE_REFRESH_TOKEN_SQL,
+            {
+                "tenant_id": tenant_id,
+                "jti": jti,
+                "new_id": new_id,
+                "new_jti": new_jti,
+                "token_hash": token_hash,
+                "expires_at": expires_at
+            }
         )
-        return result.scalar_one_or_none()
+        row = result.first()
+        await self.session.commit()
+        if row is not None:
+            logger.info("Refresh token rotated: {}", jti)
+        return row
 
-    async def revoke_refresh_token(self, jti: str, tenant_id: UUID) -> None:
-        """Revoke refresh token."""
+    async def revoke_refresh_token(self, jti: UUID, tenant_id: UUID) -> bool:
+        """Revoke refresh token. Returns False if no live token matched."""
         result = await self.session.execute(
-            select(RefreshToken).where(
+            update(RefreshToken)
+            .where(
+                RefreshToken.tenant_id == tenant_id,
                 RefreshToken.jti == jti,
-                RefreshToken.tenant_id == tenant_id
+                RefreshToken.is_revoked == False
             )
+            .values(is_revoked=True)
+            .returning(RefreshToken.id)
+            .execution_options(synchronize_session=False)
         )
-        token = result.scalar_one_or_none()
-        if token:
-            token.is_revoked = True
-            await self.session.commit()
-            logger.info(f"Refresh token revoked: {jti}")
+        revoked = result.first() is not None
+        await self.session.commit()
+        if revoked:
+            logger.info("Refresh token revoked: {}", jti)
+        return revoked
+
+    async def revoke_family_if_reused(self, jti: UUID, tenant_id: UUID) -> Optional[bool]:
+        """
+        Revoke a token's family if the token itself was already revoked (reuse).
 
-    async def revoke_token_family(self, family_id: UUID, tenant_id: UUID) -> None:
-        """Revoke entire token family."""
+        Returns None if the token is unknown, True if reuse was detected and the
+        family revoked, False if the token is still live.
+        """
         result = await self.session.execute(
-            select(RefreshToken).where(
-                RefreshToken.family_id == family_id,
-                RefreshToken.tenant_id == tenant_id
-            )
+            REVOKE_REUSED_TOKEN_FAMILY_SQL,
+            {"tenant_id": tenant_id, "jti": jti}
         )
-        tokens = result.scalars().all()
-        for token in tokens:
-            token.is_revoked = True
+        was_revoked = result.scalar_one_or_none()
         await self.session.commit()
-        logger.warning(f"Token family revoked: {family_id}")
+        if was_revoked:
+            logger.warning("Token family revoked after reuse of: {}", jti)
+        return was_revoked
 
-    async def revoke_all_user_tokens(self, user_id: UUID, tenant_id: UUID) -> None:
-        """Revoke all refresh tokens for a user."""
+    async def purge_expired_refresh_tokens(self, retention_days: int = 7) -> int:
+        """Delete refresh tokens that expired more than retention_days ago."""
+        cutoff = get_utc_now() - timedelta(days=retention_days)
         result = await self.session.execute(
-            select(RefreshToken).where(
-                RefreshToken.user_id == user_id,
-                RefreshToken.tenant_id == tenant_id,
-                RefreshToken.is_revoked == False
-            )
+            delete(RefreshToken).where(RefreshToken.expires_at < cutoff)
         )
-        tokens = result.scalars().all()
-        for token in tokens:
-            token.is_revoked = True
         await self.session.commit()
-        logger.info(f"All tokens revoked for user: {user_id}")
+        logger.info("Purged {} expired refresh tokens", result.rowcount)
+        return result.rowcount
 
     async def store_password_reset_token(
         self,
         user_id: UUID,
         tenant_id: UUID,
-        token: str,
+        token_hash: bytes,
         expires_at: datetime
     ) -> PasswordResetToken:
-        """Store password reset token."""
+        """Store password reset token digest."""
         reset_token = PasswordResetToken(
             user_id=user_id,
             tenant_id=tenant_id,
-            token=token,
+            token_hash=token_hash,
             expires_at=expires_at
         )
         self.session.add(reset_token)
         await self.session.commit()
-        await self.session.refresh(reset_token)
-        logger.info(f"Password reset token created for user: {user_id}")
+        logger.info("Password reset token created for user: {}", user_id)
         return reset_token
 
-    async def get_password_reset_token(self, token: str) -> Optional[dict]:
-        """Get valid password reset token."""
+    async def get_password_reset_token(self, token_hash: bytes) -> Optional[dict]:
+        """Get valid password reset token whose user still exists."""
         result = await self.session.execute(
-            select(PasswordResetToken).where(
-                PasswordResetToken.token == token,
+            select(PasswordResetToken.user_id, PasswordResetToken.tenant_id)
+            .join(
+                User,
+                (User.id == PasswordResetToken.user_id)
+                & (User.tenant_id == PasswordResetToken.tenant_id)
+            )
+            .where(
+                PasswordResetToken.token_hash == token_hash,
                 PasswordResetToken.is_used == False,
                 PasswordResetToken.expires_at > get_utc_now()
             )
         )
-        reset_token = result.scalar_one_or_none()
-        if reset_token:
-            return {
-                "user_id": reset_token.user_id,
-                "tenant_id": reset_token.tenant_id
-            }
-        return None
+        row = result.mappings().first()
+        return dict(row) if row else None
+
+    async def complete_password_reset(self, token_hash: bytes, password_hash: str) -> Optional[UUID]:
+        """
+        Claim a reset token, set the new password and revoke all refresh tokens.
 
-    async def invalidate_password_reset_token(self, token: str) -> None:
-        """Invalidate password reset token."""
+        Returns the user id, or None if the token was already used or expired.
+        """
         result = await self.session.execute(
-            select(PasswordResetToken).where(
-                PasswordResetToken.token == token
-            )
+            COMPLETE_PASSWORD_RESET_SQL,
+            {"token_hash": token_hash, "password_hash": password_hash}
         )
-        reset_token = result.scalar_one_or_none()
-        if reset_token:
-            reset_token.is_used = True
-            await self.session.commit()
-            logger.info(f"Password reset token invalidated")
+        user_id = result.scalar_one_or_none()
+        await self.session.commit()
+        return user_id
 
@@ -1,6 +1,7 @@
 """Auth API router."""
-from typing import Any, Dict
-from fastapi import APIRouter, Depends, Request, status
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 from app.auth.schemas import (
@@ -26,24 +27,39 @@ from app.auth.handlers import (
     RegisterUserHandler,
     LoginHandler,
     RefreshTokenHandler,
+    LogoutHandler,
     EnableMFAHandler,
     VerifyMFAHandler,
     RequestPasswordResetHandler,
     ResetPasswordHandler
 )
-from app.auth.repository import AuthRepository
+from app.config import settings
+from app.shared.context import get_request_context, get_tenant_id
 from app.shared.database import get_db
-from app.shared.response import create_success_response
+from app.shared.response import StandardResponse, create_success_response, render_response
 
 
 router = APIRouter(prefix="/api/v1/auth", tags=["Authentication"])
 
+# Fallback tenant for non-production requests that carry no tenant
+DEFAULT_DEV_TENANT_ID = UUID("00000000-0000-0000-0000-000000000001")
 
-@router.post("/register", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
+# Handlers are stateless; each call receives the request's DB session
+_register_handler = RegisterUserHandler()
+_login_handler = LoginHandler()
+_refresh_token_handler = RefreshTokenHandler()
+_logout_handler = LogoutHandler()
+_enable_mfa_handler = EnableMFAHandler()
+_verify_mfa_handler = VerifyMFAHandler()
+_request_password_reset_handler = RequestPasswordResetHandler()
+_reset_password_handler = ResetPasswordHandler()
+
+
+@router.post("/register", responses={201: {"model": StandardResponse}}, status_code=status.HTTP_201_CREATED)
 async def register(
     request: RegisterUserRequest,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Register a new user.
 
     Returns the created user details.
@@ -52,9 +68,6 @@ async def register(
     during registration. In production, you may want to validate the tenant exists
     or use a different tenant resolution strategy (subdomain, header, etc.).
     """
-    repository = AuthRepository(db)
-    handler = RegisterUserHandler(repository)
-
     command = RegisterUserCommand(
         email=request.email,
         username=request.username,
@@ -62,15 +75,15 @@ async def register(
         tenant_id=request.tenant_id
     )
 
-    result = await handler.handle(command)
-    return create_success_response(result.model_dump()).model_dump()
+    result = await _register_handler.handle(command, db)
+    return render_response(create_success_response(result), status.HTTP_201_CREATED)
 
 
-@router.post("/login", response_model=Dict[str, Any])
+@router.post("/login", responses={200: {"model": StandardResponse}})
 async def login(
     request: LoginRequest,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Login user and get access token.
 
     Returns JWT access token and refresh token for authentication.
@@ -81,35 +94,20 @@ async def login(
 
     In production, tenant_id is required.
     """
-    from uuid import UUID
-    from app.shared.context import get_tenant_id
-    from app.config import settings
-
-    repository = AuthRepository(db)
-    handler = LoginHandler(repository)
-
-    # Determine tenant_id using multiple strategies
-    tenant_id = None
-
-    # Option 1: Check if LoginRequest has tenant_id (requires schema update)
-    if hasattr(request, 'tenant_id') and request.tenant_id:
-        tenant_id = request.tenant_id
-
-    # Option 2: Try to get from context (set by tenant_resolver_middleware from X-Tenant-ID header)
-    if not tenant_id:
-        tenant_id = get_tenant_id()
+    # Determine tenant_id: request body first, then context (set by
+    # tenant_resolver_middleware from the X-Tenant-ID header)
+    tenant_id = request.tenant_id or get_tenant_id()
 
     # In production, tenant_id is required
     if not tenant_id:
         if settings.environment == "production":
-            from fastapi import HTTPException
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Tenant ID is required. Provide either tenant_id in request body or X-Tenant-ID header."
             )
         else:
             # Only for development/testing - use default tenant
-            tenant_id = UUID("00000000-0000-0000-0000-000000000001")
+            tenant_id = DEFAULT_DEV_TENANT_ID
             logger.warning(f"Using default tenant_id for login in {settings.environment}: {request.email}")
 
     command = LoginCommand(
@@ -120,27 +118,24 @@ async def login(
         device_fingerprint=request.device_fingerprint
     )
 
-    result = await handler.handle(command)
-    return create_success_response(result.model_dump()).model_dump()
+    result = await _login_handler.handle(command, db)
+    return render_response(create_success_response(result))
 
 
-@router.post("/refresh", response_model=Dict[str, Any])
+@router.post("/refresh", responses={200: {"model": StandardResponse}})
 async def refresh_token(
     request: RefreshTokenRequest,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Refresh access token using a valid refresh token.
 
     Returns new access token and refresh token pair.
     Old refresh token is automatically revoked.
     """
-    repository = AuthRepository(db)
-    handler = RefreshTokenHandler(repository)
-
     command = RefreshTokenCommand(refresh_token=request.refresh_token)
 
-    result = await handler.handle(command)
-    return create_success_response(result.model_dump()).model_dump()
+    result = await _refresh_token_handler.handle(command, db)
+    return render_response(create_success_response(result))
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
@@ -149,17 +144,10 @@ async def logout(
     db: AsyncSession = Depends(get_db)
 ) -> None:
     """Logout user and revoke refresh token."""
-    from app.shared.context import get_tenant_id
-    from app.auth.handlers import LogoutHandler
-
-    repository = AuthRepository(db)
-    handler = LogoutHandler(repository)
-
     # Get tenant_id from context (set by tenant_resolver_middleware)
     tenant_id = get_tenant_id()
     if not tenant_id:
-        from uuid import UUID
-        tenant_id = UUID("00000000-0000-0000-0000-000000000001")
+        tenant_id = DEFAULT_DEV_TENANT_ID
         logger.warning(f"Using default tenant_id for logout")
 
     command = LogoutCommand(
@@ -167,123 +155,104 @@ async def logout(
         tenant_id=tenant_id
     )
 
-    await handler.handle(command)
+    await _logout_handler.handle(command, db)
 
 
-@router.post("/mfa/enable", response_model=Dict[str, Any])
+@router.post("/mfa/enable", responses={200: {"model": StandardResponse}})
 async def enable_mfa(
     request_obj: Request,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Enable TOTP-based MFA for the current user.
 
     Returns the TOTP secret and a provisioning URL for QR code generation.
     User must verify the MFA code using /mfa/verify to complete setup.
     """
-    from app.shared.context import get_user_id, get_tenant_id
-
-    user_id = get_user_id()
-    tenant_id = get_tenant_id()
+    ctx = get_request_context()
+    user_id = ctx.user_id
+    tenant_id = ctx.tenant_id
 
     if not user_id or not tenant_id:
-        from fastapi import HTTPException
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication required"
         )
 
-    repository = AuthRepository(db)
-    handler = EnableMFAHandler(repository)
-
     command = EnableMFACommand(
         user_id=user_id,
         tenant_id=tenant_id
     )
 
-    result = await handler.handle(command)
-    return create_success_response(result).model_dump()
+    result = await _enable_mfa_handler.handle(command, db)
+    return render_response(create_success_response(result))
 
 
-@router.post("/mfa/verify", response_model=Dict[str, Any])
+@router.post("/mfa/verify", responses={200: {"model": StandardResponse}})
 async def verify_mfa(
     request: VerifyMFARequest,
     request_obj: Request,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Verify MFA setup with a TOTP code.
 
     Completes MFA setup by verifying the user can generate valid codes.
     """
-    from app.shared.context import get_user_id, get_tenant_id
-
-    user_id = get_user_id()
-    tenant_id = get_tenant_id()
+    ctx = get_request_context()
+    user_id = ctx.user_id
+    tenant_id = ctx.tenant_id
 
     if not user_id or not tenant_id:
-        from fastapi import HTTPException
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication required"
         )
 
-    repository = AuthRepository(db)
-    handler = VerifyMFAHandler(repository)
-
     command = VerifyMFACommand(
         user_id=user_id,
         tenant_id=tenant_id,
         code=request.code
     )
 
-    result = await handler.handle(command)
-    return create_success_response(result).model_dump()
+    result = await _verify_mfa_handler.handle(command, db)
+    return render_response(create_success_response(result))
 
 
-@router.post("/password/reset-request", response_model=Dict[str, Any])
+@router.post("/password/reset-request", responses={200: {"model": StandardResponse}})
 async def request_password_reset(
     request: RequestPasswordResetRequest,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Initiate password reset flow.
 
     Sends a password reset link to the user's email (if it exists).
     Always returns success to prevent user enumeration.
     """
-    from app.shared.context import get_tenant_id
-    from uuid import UUID
-
     tenant_id = get_tenant_id()
     if not tenant_id:
-        tenant_id = UUID("00000000-0000-0000-0000-000000000001")
-
-    repository = AuthRepository(db)
-    handler = RequestPasswordResetHandler(repository)
+        tenant_id = DEFAULT_DEV_TENANT_ID
 
     command = RequestPasswordResetCommand(
         email=request.email,
         tenant_id=tenant_id
     )
 
-    result = await handler.handle(command)
-    return create_success_response(result).model_dump()
+    result = await _request_password_reset_handler.handle(command, db)
+    return render_response(create_success_response(result))
 
 
-@router.post("/password/reset", response_model=Dict[str, Any])
+@router.post("/password/reset", responses={200: {"model": StandardResponse}})
 async def reset_password(
     request: ResetPasswordRequest,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Complete password reset with token.
 
     Validates the reset token and sets the new password.
     """
-    repository = AuthRepository(db)
-    handler = ResetPasswordHandler(repository)
-
     command = ResetPasswordCommand(
         token=request.token,
         new_password=request.new_password
     )
 
-    result = await handler.handle(command)
-    return create_success_response(result).model_dump()
+    result = await _reset_password_handler.handle(command, db)
+    return render_response(create_success_response(result))
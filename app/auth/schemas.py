@@ -1,10 +1,13 @@
 """Auth schemas (Pydantic models)."""
-from typing import Optional, List
+from typing import Optional, List, TYPE_CHECKING
 from datetime import datetime
 from uuid import UUID
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from app.shared.security.password import password_handler
 
+if TYPE_CHECKING:
+    from app.auth.domain.models import User
+
 
 class RegisterUserRequest(BaseModel):
     """Register user request schema."""
@@ -93,3 +96,20 @@ class UserResponse(BaseModel):
     class Config:
         from_attributes = True
 
+    @classmethod
+    def from_user(cls, user: "User") -> "UserResponse":
+        """Build a response from a persisted User without re-validating its fields."""
+        return cls.model_construct(
+            id=user.id,
+            tenant_id=user.tenant_id,
+            email=user.email,
+            username=user.username,
+            roles=user.roles,
+            permissions=user.permissions,
+            department_id=user.department_id,
+            is_active=user.is_active,
+            email_verified=user.email_verified,
+            mfa_enabled=user.mfa_enabled,
+            created_at=user.created_at,
+            updated_at=user.updated_at
+        )
@@ -1,6 +1,7 @@
 """Application configuration module."""
 import os
-from typing import List, Optional
+from functools import cached_property
+from typing import Optional, Tuple
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,9 +11,22 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = Field(..., alias="DATABASE_URL")
+    # Size per process; keep workers * (size + overflow) below Postgres max_connections
+    db_pool_size: int = Field(default=50, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=100, alias="DB_MAX_OVERFLOW")
+    # Seconds to wait for a free connection before failing the request
+    db_pool_timeout: int = Field(default=10, alias="DB_POOL_TIMEOUT")
+    # Recycle connections before server/proxy idle timeouts close them
+    db_pool_recycle: int = Field(default=1800, alias="DB_POOL_RECYCLE")
 
     # Redis
     redis_url: str = Field(..., alias="REDIS_URL")
+    redis_max_connections: int = Field(default=64, alias="REDIS_MAX_CONNECTIONS")
+    # Connections opened at startup so the first burst skips TCP/TLS setup
+    redis_warm_connections: int = Field(default=8, alias="REDIS_WARM_CONNECTIONS")
+    # Run delete_pattern as a server-side Lua SCAN/UNLINK loop (one round-trip,
+    # but blocks Redis for the whole scan on very large keyspaces)
+    redis_lua_delete_pattern: bool = Field(default=False, alias="REDIS_LUA_DELETE_PATTERN")
 
     # Security
     secret_key: str = Field(..., alias="SECRET_KEY")
@@ -21,6 +35,12 @@ class Settings(BaseSettings):
     jwt_algorithm: str = Field(default="RS256", alias="JWT_ALGORITHM")
     access_token_expire_minutes: int = Field(default=15, alias="ACCESS_TOKEN_EXPIRE_MINUTES")
     refresh_token_expire_days: int = Field(default=7, alias="REFRESH_TOKEN_EXPIRE_DAYS")
+    # Key for hashing stored refresh tokens; falls back to SECRET_KEY when unset
+    token_hash_pepper: Optional[str] = Field(default=None, alias="TOKEN_HASH_PEPPER")
+    # Argon2id cost parameters (defaults: OWASP interactive-login profile)
+    argon2_time_cost: int = Field(default=2, alias="ARGON2_TIME_COST")
+    argon2_memory_cost: int = Field(default=19456, alias="ARGON2_MEMORY_COST")
+    argon2_parallelism: int = Field(default=1, alias="ARGON2_PARALLELISM")
 
     # Application
     environment: str = Field(default="development", alias="ENVIRONMENT")
@@ -39,6 +59,14 @@ class Settings(BaseSettings):
     otlp_endpoint: Optional[str] = Field(default=None, alias="OTLP_ENDPOINT")
     otel_service_name: str = Field(default="task-management-system", alias="OTEL_SERVICE_NAME")
     otel_enabled: bool = Field(default=True, alias="OTEL_ENABLED")
+    # Print spans to stdout when no OTLP endpoint is configured (slow; debugging only)
+    otel_console_traces: bool = Field(default=False, alias="OTEL_CONSOLE_TRACES")
+    # Batch span processor: larger queue absorbs bursts, smaller and more
+    # frequent batches keep export lag and per-export memory low
+    otel_bsp_max_queue_size: int = Field(default=4096, alias="OTEL_BSP_MAX_QUEUE_SIZE")
+    otel_bsp_max_export_batch_size: int = Field(default=256, alias="OTEL_BSP_MAX_EXPORT_BATCH_SIZE")
+    otel_bsp_schedule_delay_millis: int = Field(default=1000, alias="OTEL_BSP_SCHEDULE_DELAY")
+    otel_bsp_export_timeout_millis: int = Field(default=10000, alias="OTEL_BSP_EXPORT_TIMEOUT")
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -47,22 +75,27 @@ class Settings(BaseSettings):
         extra="ignore"
     )
 
-    @property
-    def cors_origins_list(self) -> List[str]:
-        """Get CORS origins as list."""
-        return [origin.strip() for origin in self.cors_origins.split(",")]
+    @cached_property
+    def debug_logging(self) -> bool:
+        """Whether DEBUG-level logs are emitted (lets hot paths skip building them)."""
+        return self.log_level.upper() in ("TRACE", "DEBUG")
 
-    @property
+    @cached_property
+    def cors_origins_list(self) -> Tuple[str, ...]:
+        """Get CORS origins as an immutable sequence (parsed once)."""
+        return tuple(origin.strip() for origin in self.cors_origins.split(","))
+
+    @cached_property
     def jwt_private_key(self) -> str:
-        """Load JWT private key from file."""
+        """Load JWT private key from file (read once, then cached)."""
         if not os.path.exists(self.jwt_private_key_path):
             raise FileNotFoundError(f"JWT private key not found: {self.jwt_private_key_path}")
         with open(self.jwt_private_key_path, "r") as f:
             return f.read()
 
-    @property
+    @cached_property
     def jwt_public_key(self) -> str:
-        """Load JWT public key from file."""
+        """Load JWT public key from file (read once, then cached)."""
         if not os.path.exists(self.jwt_public_key_path):
             raise FileNotFoundError(f"JWT public key not found: {self.jwt_public_key_path}")
         with open(self.jwt_public_key_path, "r") as f:
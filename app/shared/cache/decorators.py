@@ -1,13 +1,53 @@
 """Cache decorator for query handlers."""
+import asyncio
 import functools
 import hashlib
-from typing import Any, Callable
+import inspect
+from typing import Any, Callable, Dict, Tuple
+import orjson
+from app.config import settings
 from app.shared.cache.redis_client import redis_client
-from app.shared.context import get_tenant_id
+from app.shared.context import request_context
 from loguru import logger
 from pydantic import BaseModel
 
 
+_KEY_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+# Returned by the cache lookup when the key is absent
+_MISS = object()
+
+# Cache misses currently being computed, keyed by cache key. Concurrent
+# misses for the same key await the first caller's result (single flight).
+_inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+
+class _LeaderCancelled(Exception):
+    """The caller computing a shared miss was cancelled before finishing."""
+
+
+def _consume_exception(future: "asyncio.Future[Any]") -> None:
+    """Mark a shared result's exception as retrieved when nobody awaited it."""
+    if not future.cancelled():
+        future.exception()
+
+
+def _key_default(obj: Any) -> Any:
+    """Serialize cache-key arguments that orjson does not handle natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    return repr(obj)
+
+
+def _hash_arguments(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    """Hash call arguments into a short, stable cache-key component."""
+    try:
+        material = orjson.dumps((args, kwargs), default=_key_default, option=_KEY_OPTIONS)
+    except TypeError:
+        material = repr((args, sorted(kwargs.items()))).encode("utf-8")
+    return hashlib.blake2b(material, digest_size=8).hexdigest()
+
+
 def cached(ttl: int = 300, key_prefix: str = "") -> Callable:
     """
     Cache decorator for query handlers.
@@ -17,40 +57,62 @@ def cached(ttl: int = 300, key_prefix: str = "") -> Callable:
         key_prefix: Prefix for cache key
     """
     def decorator(func: Callable) -> Callable:
+        # Fixed per function: whether the first argument is a bound `self`,
+        # and the key segment following the tenant id
+        params = list(inspect.signature(func).parameters)
+        skip_self = bool(params) and params[0] == "self"
+        key_base = f"{key_prefix}:{func.__name__}:"
+        # Cached models are stored as dicts; hits are rebuilt into the declared model
+        return_type = inspect.signature(func).return_annotation
+        model_type = (
+            return_type
+            if isinstance(return_type, type) and issubclass(return_type, BaseModel)
+            else None
+        )
+
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            tenant_id = get_tenant_id()
+            tenant_id = request_context.get().tenant_id
             if not tenant_id:
                 return await func(*args, **kwargs)
 
             # Build a stable key: skip bound `self` if present, then hash args/kwargs
-            effective_args = args
-            if args:
-                try:
-                    cls_name = func.__qualname__.split('.')[0]
-                    if hasattr(args[0], '__class__') and args[0].__class__.__name__ == cls_name:
-                        effective_args = args[1:]
-                except Exception:
-                    effective_args = args
-
-            try:
-                args_repr = [repr(a) for a in effective_args]
-                kwargs_repr = {k: repr(v) for k, v in sorted(kwargs.items())}
-                key_material = repr((args_repr, kwargs_repr))
-                key_hash = hashlib.sha256(key_material.encode('utf-8')).hexdigest()[:16]
-            except Exception:
-                key_hash = hashlib.sha256(repr((str(effective_args), str(kwargs))).encode('utf-8')).hexdigest()[:16]
-
-            cache_key = f"tenant:{tenant_id}:{key_prefix}:{func.__name__}:{key_hash}"
+            key_hash = _hash_arguments(args[1:] if skip_self else args, kwargs)
+            cache_key = f"tenant:{tenant_id}:{key_base}{key_hash}"
 
             # Try to get from cache
-            cached_value = await redis_client.get(cache_key)
-            if cached_value is not None:
-                logger.debug(f"Cache hit for key: {cache_key}")
+            # A cached None (negative result) is a hit too; only _MISS re-runs func
+            cached_value = await redis_client.batched_get(cache_key, default=_MISS)
+            if cached_value is not _MISS:
+                if settings.debug_logging:
+                    logger.debug("Cache hit for key: {}", cache_key)
+                if model_type is not None and cached_value is not None:
+                    return model_type.model_validate(cached_value)
                 return cached_value
 
-            # Execute function
-            result = await func(*args, **kwargs)
+            # Another caller is already computing this key: share its result
+            leader = _inflight.get(cache_key)
+            if leader is not None:
+                try:
+                    return await asyncio.shield(leader)
+                except _LeaderCancelled:
+                    return await func(*args, **kwargs)
+
+            shared: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+            shared.add_done_callback(_consume_exception)
+            _inflight[cache_key] = shared
+            try:
+                # Execute function
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                shared.set_exception(e)
+                raise
+            except BaseException:
+                shared.set_exception(_LeaderCancelled())
+                raise
+            finally:
+                del _inflight[cache_key]
+            shared.set_result(result)
 
             # Convert Pydantic models to dict for JSON serialization
             if isinstance(result, BaseModel):
@@ -59,8 +121,9 @@ def cached(ttl: int = 300, key_prefix: str = "") -> Callable:
                 cache_data = result
 
             # Store in cache
-            await redis_client.set(cache_key, cache_data, ttl)
-            logger.debug(f"Cache miss for key: {cache_key}")
+            await redis_client.batched_set(cache_key, cache_data, ttl)
+            if settings.debug_logging:
+                logger.debug("Cache miss for key: {}", cache_key)
 
             return result
 
@@ -1,10 +1,77 @@
 """Redis client for caching."""
-import json
-from typing import Any, Optional
-from redis.asyncio import Redis
+import asyncio
+import contextvars
+from typing import Any, Dict, List, Optional, Tuple
+import orjson
+from redis.asyncio import ConnectionPool, Redis
+from redis.commands.core import AsyncScript
+from redis.utils import HIREDIS_AVAILABLE
 from app.config import settings
 from loguru import logger
 
+try:
+    import zstandard
+except ImportError:  # optional: large entries are stored uncompressed
+    zstandard = None
+
+
+# Marks a key that is absent (or unreadable), as opposed to a cached null
+_ABSENT = object()
+
+# Serialized values larger than this are zstd-compressed (when available).
+# Compressed entries are recognised by the zstd frame magic, which can never
+# start a JSON document, so plain and compressed entries coexist.
+COMPRESSION_THRESHOLD_BYTES = 1024
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_compressor = zstandard.ZstdCompressor(level=1) if zstandard else None
+_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+
+def _serialize(value: Any) -> bytes:
+    """Encode a cache value as JSON, compressing large payloads."""
+    # orjson handles UUID/datetime natively; default=str covers other types
+    data = orjson.dumps(value, default=str)
+    if _compressor is not None and len(data) > COMPRESSION_THRESHOLD_BYTES:
+        return _compressor.compress(data)
+    return data
+
+
+def _deserialize(data: bytes) -> Any:
+    """Decode a cache value written by _serialize."""
+    if data.startswith(_ZSTD_MAGIC):
+        if _decompressor is None:
+            raise RuntimeError("zstandard is not installed; cannot read compressed cache entry")
+        data = _decompressor.decompress(data)
+    return orjson.loads(data)
+
+
+# Keys examined per SCAN call, and keys per UNLINK batch
+SCAN_BATCH_SIZE = 1000
+
+# Server-side pattern delete: SCAN and UNLINK each batch until the cursor wraps
+DELETE_PATTERN_LUA = """
+local cursor = "0"
+local deleted = 0
+repeat
+    local reply = redis.call("SCAN", cursor, "MATCH", ARGV[1], "COUNT", ARGV[2])
+    cursor = reply[1]
+    local keys = reply[2]
+    if #keys > 0 then
+        deleted = deleted + redis.call("UNLINK", unpack(keys))
+    end
+until cursor == "0"
+return deleted
+"""
+
+# Counter increment that starts the expiry window on the first hit, atomically
+INCR_WITH_EXPIRY_LUA = """
+local count = redis.call("INCR", KEYS[1])
+if count == 1 then
+    redis.call("EXPIRE", KEYS[1], ARGV[1])
+end
+return count
+"""
+
 
 class RedisClient:
     """Redis client wrapper for caching operations."""
@@ -12,21 +79,41 @@ class RedisClient:
     def __init__(self) -> None:
         """Initialize Redis client."""
         self.redis: Optional[Redis] = None
+        self._delete_pattern_script: Optional[AsyncScript] = None
+        self._incr_with_expiry_script: Optional[AsyncScript] = None
+        # Per-tick batching state: GETs coalesce into one MGET and SETs into
+        # one pipeline, flushed by a task scheduled on the first queued call
+        self._pending_gets: Dict[str, List[asyncio.Future]] = {}
+        self._get_flush_task: Optional[asyncio.Task] = None
+        self._pending_sets: Dict[str, Tuple[bytes, int]] = {}
+        self._set_waiters: List[asyncio.Future] = []
+        self._set_flush_task: Optional[asyncio.Task] = None
 
     async def connect(self) -> None:
         """Connect to Redis."""
-        self.redis = Redis.from_url(
+        # Values are orjson bytes; skip redis-py's per-reply UTF-8 decoding
+        pool = ConnectionPool.from_url(
             settings.redis_url,
-            encoding="utf-8",
-            decode_responses=True
+            max_connections=settings.redis_max_connections,
+            health_check_interval=30,
+            socket_keepalive=True,
+            decode_responses=False
+        )
+        self.redis = Redis.from_pool(pool)
+        # Sent via EVALSHA, falling back to EVAL only if the script cache is cold
+        self._delete_pattern_script = self.redis.register_script(DELETE_PATTERN_LUA)
+        self._incr_with_expiry_script = self.redis.register_script(INCR_WITH_EXPIRY_LUA)
+
+        # Concurrent pings each check out a connection, pre-opening the pool
+        await asyncio.gather(
+            *(self.redis.ping() for _ in range(max(1, settings.redis_warm_connections)))
         )
-        await self.redis.ping()
-        logger.info("Redis connected successfully")
+        logger.info(f"Redis connected successfully (hiredis parser: {HIREDIS_AVAILABLE})")
 
     async def disconnect(self) -> None:
         """Disconnect from Redis."""
         if self.redis:
-            await self.redis.close()
+            await self.redis.aclose()
             logger.info("Redis disconnected")
 
     async def get(self, key: str) -> Optional[Any]:
@@ -37,7 +124,7 @@ class RedisClient:
         try:
             value = await self.redis.get(key)
             if value:
-                return json.loads(value)
+                return _deserialize(value)
             return None
         except Exception as e:
             logger.error(f"Redis GET error for key {key}: {e}")
@@ -49,14 +136,116 @@ class RedisClient:
             return False
 
         try:
-            # Use default=str so UUIDs and other non-JSON types serialize to their string representation
-            serialized = json.dumps(value, default=str)
+            serialized = _serialize(value)
             await self.redis.setex(key, ttl, serialized)
             return True
         except Exception as e:
             logger.error(f"Redis SET error for key {key}: {e}")
             return False
 
+    async def batched_get(self, key: str, default: Any = None) -> Any:
+        """
+        Get value from cache, coalescing with other GETs issued in the same tick.
+
+        All keys requested before the event loop runs the flush task are
+        fetched with a single MGET. Returns `default` when the key is absent,
+        so callers passing a sentinel can tell a miss from a cached null.
+        """
+        if not self.redis:
+            return default
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending_gets.setdefault(key, []).append(future)
+        if self._get_flush_task is None:
+            # The batch serves many requests; don't attribute its span or errors to this one
+            self._get_flush_task = asyncio.create_task(self._flush_gets(), context=contextvars.Context())
+        result = await future
+        return default if result is _ABSENT else result
+
+    async def _flush_gets(self) -> None:
+        """Resolve all queued GETs with one MGET."""
+        pending, self._pending_gets = self._pending_gets, {}
+        self._get_flush_task = None
+        keys = list(pending)
+
+        try:
+            values = await self.redis.mget(keys)
+        except Exception as e:
+            logger.error(f"Redis MGET error for {len(keys)} keys: {e}")
+            values = [None] * len(keys)
+
+        for key, value in zip(keys, values):
+            try:
+                result = _deserialize(value) if value else _ABSENT
+            except Exception as e:
+                logger.error(f"Redis GET error for key {key}: {e}")
+                result = _ABSENT
+            for future in pending[key]:
+                if not future.done():
+                    future.set_result(result)
+
+    async def batched_set(self, key: str, value: Any, ttl: int = 300) -> bool:
+        """
+        Set value in cache with TTL, pipelining with other SETs issued in the same tick.
+        """
+        if not self.redis:
+            return False
+
+        try:
+            serialized = _serialize(value)
+        except Exception as e:
+            logger.error(f"Redis SET error for key {key}: {e}")
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending_sets[key] = (serialized, ttl)
+        self._set_waiters.append(future)
+        if self._set_flush_task is None:
+            self._set_flush_task = asyncio.create_task(self._flush_sets(), context=contextvars.Context())
+        return await future
+
+    async def _flush_sets(self) -> None:
+        """Write all queued SETs in one non-transactional pipeline."""
+        pending, self._pending_sets = self._pending_sets, {}
+        waiters, self._set_waiters = self._set_waiters, []
+        self._set_flush_task = None
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, (serialized, ttl) in pending.items():
+                pipe.setex(key, ttl, serialized)
+            await pipe.execute()
+            ok = True
+        except Exception as e:
+            logger.error(f"Redis pipelined SET error for {len(pending)} keys: {e}")
+            ok = False
+
+        for future in waiters:
+            if not future.done():
+                future.set_result(ok)
+
+    async def incr_with_expiry(self, key: str, ttl: int) -> int:
+        """
+        Increment a counter, setting its TTL when the increment creates it.
+
+        Runs as one script call, so the key can never be left without an
+        expiry. Unlike the cache helpers, errors propagate to the caller.
+
+        Args:
+            key: Counter key
+            ttl: Expiry in seconds applied on the first increment
+
+        Returns:
+            Counter value after the increment
+
+        Raises:
+            RuntimeError: If Redis is not connected
+        """
+        if not self.redis or not self._incr_with_expiry_script:
+            raise RuntimeError("Redis not connected")
+
+        return await self._incr_with_expiry_script(keys=[key], args=[ttl])
+
     async def delete(self, key: str) -> bool:
         """Delete key from cache."""
         if not self.redis:
@@ -75,13 +264,21 @@ class RedisClient:
             return 0
 
         try:
-            keys = []
-            async for key in self.redis.scan_iter(match=pattern):
-                keys.append(key)
+            if settings.redis_lua_delete_pattern and self._delete_pattern_script:
+                return await self._delete_pattern_script(args=[pattern, SCAN_BATCH_SIZE])
 
-            if keys:
-                return await self.redis.delete(*keys)
-            return 0
+            # UNLINK frees memory off Redis's main thread; delete batch by batch
+            # instead of buffering every matching key first
+            deleted = 0
+            batch: List[bytes] = []
+            async for key in self.redis.scan_iter(match=pattern, count=SCAN_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= SCAN_BATCH_SIZE:
+                    deleted += await self.redis.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.redis.unlink(*batch)
+            return deleted
         except Exception as e:
             logger.error(f"Redis DELETE PATTERN error for pattern {pattern}: {e}")
             return 0
@@ -1,40 +1,80 @@
 """Request context management using context variables."""
 from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from typing import Optional
 from uuid import UUID
 
 
-tenant_id_context: ContextVar[Optional[UUID]] = ContextVar("tenant_id", default=None)
-user_id_context: ContextVar[Optional[UUID]] = ContextVar("user_id", default=None)
-correlation_id_context: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+@dataclass(frozen=True, slots=True)
+class RequestContext:
+    """Per-request identity and tracing values."""
+    tenant_id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    correlation_id: Optional[str] = None
+    # ISO-8601 UTC time the request started, reused by every response body
+    timestamp: Optional[str] = None
+
+
+# A single ContextVar holds an immutable RequestContext: readers need one
+# lookup for all fields, and setters install an updated copy so values never
+# leak between requests or tasks sharing a context snapshot.
+request_context: ContextVar[RequestContext] = ContextVar("request_context", default=RequestContext())
+
+
+@lru_cache(maxsize=8192)
+def parse_uuid(value: str) -> UUID:
+    """
+    Parse a UUID string, reusing the object for IDs seen recently.
+
+    Tenant and user IDs repeat across requests, so most lookups skip parsing.
+
+    Raises:
+        ValueError: If the value is not a valid UUID
+    """
+    return UUID(value)
+
+
+def get_request_context() -> RequestContext:
+    """Get the current request context."""
+    return request_context.get()
 
 
 def get_tenant_id() -> Optional[UUID]:
     """Get current tenant ID from context."""
-    return tenant_id_context.get()
+    return request_context.get().tenant_id
 
 
 def set_tenant_id(tenant_id: UUID) -> None:
     """Set tenant ID in context."""
-    tenant_id_context.set(tenant_id)
+    request_context.set(replace(request_context.get(), tenant_id=tenant_id))
 
 
 def get_user_id() -> Optional[UUID]:
     """Get current user ID from context."""
-    return user_id_context.get()
+    return request_context.get().user_id
 
 
 def set_user_id(user_id: UUID) -> None:
     """Set user ID in context."""
-    user_id_context.set(user_id)
+    request_context.set(replace(request_context.get(), user_id=user_id))
+
+
+def set_user_context(user_id: UUID, tenant_id: UUID) -> None:
+    """Set authenticated user and tenant IDs in context."""
+    request_context.set(replace(request_context.get(), user_id=user_id, tenant_id=tenant_id))
 
 
 def get_correlation_id() -> Optional[str]:
     """Get current correlation ID from context."""
-    return correlation_id_context.get()
+    return request_context.get().correlation_id
 
 
 def set_correlation_id(correlation_id: str) -> None:
     """Set correlation ID in context."""
-    correlation_id_context.set(correlation_id)
+    request_context.set(replace(request_context.get(), correlation_id=correlation_id))
+
 
+def set_request_info(correlation_id: str, timestamp: str) -> None:
+    """Set correlation ID and request timestamp in context."""
+    request_context.set(replace(request_context.get(), correlation_id=correlation_id, timestamp=timestamp))
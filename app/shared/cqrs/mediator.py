@@ -1,5 +1,7 @@
 """Mediator pattern implementation for CQRS."""
-from typing import Any, Callable, Dict, Type, TypeVar
+from inspect import isawaitable
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Type, TypeVar
 from app.shared.cqrs.command import Command
 from app.shared.cqrs.query import Query
 from loguru import logger
@@ -14,45 +16,79 @@ class Mediator:
 
     def __init__(self) -> None:
         """Initialize mediator."""
-        self._command_handlers: Dict[Type[Command], Callable] = {}
-        self._query_handlers: Dict[Type[Query], Callable] = {}
+        self._command_handlers: Mapping[Type[Command], Callable[..., Any]] = {}
+        self._query_handlers: Mapping[Type[Query], Callable[..., Any]] = {}
+        self._command_lookup = self._command_handlers.get
+        self._query_lookup = self._query_handlers.get
+        self._frozen = False
+
+    def _ensure_not_frozen(self) -> None:
+        """Reject registrations once the handler tables are frozen."""
+        if self._frozen:
+            raise RuntimeError("Mediator is frozen; register handlers before startup completes")
 
     def register_command_handler(
         self,
         command_type: Type[TCommand],
-        handler: Callable[[TCommand], Any]
+        handler: Callable[..., Any]
     ) -> None:
         """
         Register command handler.
 
         Args:
             command_type: Command type
-            handler: Handler function
+            handler: Handler function, called with the command and any extra send() arguments;
+                may be synchronous or return an awaitable
+
+        Raises:
+            RuntimeError: If the mediator is frozen
         """
+        self._ensure_not_frozen()
         self._command_handlers[command_type] = handler
-        logger.debug(f"Registered command handler for {command_type.__name__}")
+        logger.debug("Registered command handler for {}", command_type.__name__)
 
     def register_query_handler(
         self,
         query_type: Type[TQuery],
-        handler: Callable[[TQuery], Any]
+        handler: Callable[..., Any]
     ) -> None:
         """
         Register query handler.
 
         Args:
             query_type: Query type
-            handler: Handler function
+            handler: Handler function, called with the query and any extra query() arguments;
+                may be synchronous or return an awaitable
+
+        Raises:
+            RuntimeError: If the mediator is frozen
         """
+        self._ensure_not_frozen()
         self._query_handlers[query_type] = handler
-        logger.debug(f"Registered query handler for {query_type.__name__}")
+        logger.debug("Registered query handler for {}", query_type.__name__)
 
-    async def send(self, command: TCommand) -> Any:
+    def freeze(self) -> None:
+        """
+        Make the handler tables read-only.
+
+        Called once at startup after all handlers are registered, so dispatch
+        is a single lookup on an immutable mapping.
+        """
+        if self._frozen:
+            return
+        self._command_handlers = MappingProxyType(dict(self._command_handlers))
+        self._query_handlers = MappingProxyType(dict(self._query_handlers))
+        self._command_lookup = self._command_handlers.get
+        self._query_lookup = self._query_handlers.get
+        self._frozen = True
+
+    async def send(self, command: TCommand, *args: Any) -> Any:
         """
         Send command to handler.
 
         Args:
             command: Command instance
+            *args: Extra arguments passed to the handler (e.g. the request's DB session)
 
         Returns:
             Handler result
@@ -60,24 +96,22 @@ class Mediator:
         Raises:
             ValueError: If no handler registered
         """
-        command_type = type(command)
-        handler = self._command_handlers.get(command_type)
-
-        if not handler:
-            raise ValueError(f"No handler registered for command {command_type.__name__}")
+        handler = self._command_lookup(type(command))
 
-        logger.info(f"Dispatching command: {command_type.__name__}")
-        result = await handler(command)
-        logger.info(f"Command {command_type.__name__} completed")
+        if handler is None:
+            raise ValueError(f"No handler registered for command {type(command).__name__}")
 
-        return result
+        # Synchronous handlers return their result directly; nothing to await
+        result = handler(command, *args)
+        return await result if isawaitable(result) else result
 
-    async def query(self, query: TQuery) -> Any:
+    async def query(self, query: TQuery, *args: Any) -> Any:
         """
         Send query to handler.
 
         Args:
             query: Query instance
+            *args: Extra arguments passed to the handler (e.g. the request's DB session)
 
         Returns:
             Handler result
@@ -85,18 +119,13 @@ class Mediator:
         Raises:
             ValueError: If no handler registered
         """
-        query_type = type(query)
-        handler = self._query_handlers.get(query_type)
+        handler = self._query_lookup(type(query))
 
-        if not handler:
-            raise ValueError(f"No handler registered for query {query_type.__name__}")
+        if handler is None:
+            raise ValueError(f"No handler registered for query {type(query).__name__}")
 
-        logger.debug(f"Dispatching query: {query_type.__name__}")
-        result = await handler(query)
-        logger.debug(f"Query {query_type.__name__} completed")
-
-        return result
+        result = handler(query, *args)
+        return await result if isawaitable(result) else result
 
 
 mediator = Mediator()
-
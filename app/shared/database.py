@@ -1,6 +1,11 @@
 """Database configuration and session management."""
-from typing import AsyncGenerator
-from datetime import datetime, UTC
+import os
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, AsyncIterator, Optional, Tuple
+from datetime import datetime, timedelta
+from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.config import settings
@@ -12,8 +17,19 @@ engine = create_async_engine(
     settings.database_url,
     echo=settings.environment == "development",
     pool_pre_ping=True,
-    pool_size=20,
-    max_overflow=10
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    # Reuse the most recently returned connection so idle ones age out
+    pool_use_lifo=True,
+    # Reuse compiled SQL for the hot auth/task statements
+    query_cache_size=1200,
+    connect_args={
+        # Per-connection prepared statements (SQLAlchemy adapter + asyncpg)
+        "prepared_statement_cache_size": 500,
+        "statement_cache_size": 500
+    }
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -25,13 +41,45 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Get database session."""
+# Session shared by everything handling the current request (see request_session)
+_request_session: ContextVar[Optional[AsyncSession]] = ContextVar("request_session", default=None)
+
+
+@asynccontextmanager
+async def request_session() -> AsyncIterator[AsyncSession]:
+    """
+    Open one session for the current request and make it the shared session.
+
+    The session only checks out a connection when first used, so requests
+    that never touch the database pay for nothing but the session object.
+    """
     async with AsyncSessionLocal() as session:
+        token = _request_session.set(session)
         try:
             yield session
         finally:
-            await session.close()
+            _request_session.reset(token)
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """Use the current request's session, or open a short-lived one outside requests."""
+    session = _request_session.get()
+    if session is not None:
+        yield session
+        return
+
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get database session."""
+    async with session_scope() as session:
+        yield session
+
+
+_UTC_EPOCH = datetime(1970, 1, 1)
 
 
 def get_utc_now() -> datetime:
@@ -41,5 +89,47 @@ def get_utc_now() -> datetime:
     Returns:
         Naive datetime in UTC
     """
-    return datetime.now(UTC).replace(tzinfo=None)
+    # Offset from a naive epoch: one datetime allocation and no tzinfo handling
+    return _UTC_EPOCH + timedelta(microseconds=time.time_ns() // 1000)
+
+
+
+def _uuid7_from(timestamp_ms: int, rand: int) -> UUID:
+    """Assemble a UUIDv7 from a millisecond timestamp and 80 random bits."""
+    value = (
+        (timestamp_ms & 0xFFFFFFFFFFFF) << 80
+        | 0x7 << 76
+        | (rand >> 62 & 0xFFF) << 64
+        | 0b10 << 62
+        | rand & 0x3FFFFFFFFFFFFFFF
+    )
+    return UUID(int=value)
+
+
+def uuid7() -> UUID:
+    """
+    Generate a time-ordered UUIDv7 (RFC 9562).
+
+    The leading 48 bits are the Unix timestamp in milliseconds, so new keys
+    append to the right edge of B-tree indexes instead of scattering.
+
+    Returns:
+        UUID version 7
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    return _uuid7_from(timestamp_ms, int.from_bytes(os.urandom(10), "big"))
+
+
+def uuid7_pair() -> Tuple[UUID, UUID]:
+    """
+    Generate two UUIDv7 values from a single clock read and urandom call.
 
+    Returns:
+        Tuple of two distinct UUID version 7 values
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    raw = os.urandom(20)
+    return (
+        _uuid7_from(timestamp_ms, int.from_bytes(raw[:10], "big")),
+        _uuid7_from(timestamp_ms, int.from_bytes(raw[10:], "big"))
+    )
@@ -1,5 +1,8 @@
 """Event dispatcher for domain events."""
-from typing import Callable, Dict, List, Type
+import asyncio
+import contextvars
+from inspect import isawaitable
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
 from app.shared.events.handler import DomainEvent
 from loguru import logger
 
@@ -9,25 +12,27 @@ class EventDispatcher:
 
     def __init__(self) -> None:
         """Initialize event dispatcher."""
-        self._handlers: Dict[Type[DomainEvent], List[Callable]] = {}
+        self._handlers: Dict[Type[DomainEvent], Tuple[Callable, ...]] = {}
+        self._background_tasks: Set[asyncio.Task] = set()
+        # Background events queued this tick with their caller's context,
+        # flushed by one scheduled task
+        self._pending_events: List[Tuple[DomainEvent, contextvars.Context]] = []
+        self._flush_task: Optional[asyncio.Task] = None
 
     def register_handler(
         self,
         event_type: Type[DomainEvent],
-        handler: Callable[[DomainEvent], None]
+        handler: Callable[[DomainEvent], Any]
     ) -> None:
         """
         Register event handler.
 
         Args:
             event_type: Event type
-            handler: Handler function
+            handler: Handler function, synchronous or async
         """
-        if event_type not in self._handlers:
-            self._handlers[event_type] = []
-
-        self._handlers[event_type].append(handler)
-        logger.debug(f"Registered event handler for {event_type.__name__}")
+        self._handlers[event_type] = self._handlers.get(event_type, ()) + (handler,)
+        logger.debug("Registered event handler for {}", event_type.__name__)
 
     async def dispatch(self, event: DomainEvent) -> None:
         """
@@ -36,25 +41,75 @@ class EventDispatcher:
         Args:
             event: Domain event
         """
-        event_type = type(event)
-        handlers = self._handlers.get(event_type, [])
+        event_name = type(event).__name__
+        handlers = self._handlers.get(type(event), ())
 
-        logger.info(
-            f"Dispatching event: {event_type.__name__}",
+        # Bound once and shared by the dispatch log and any handler errors
+        event_log = logger.bind(
             event_id=str(event.event_id),
             aggregate_id=str(event.aggregate_id),
             tenant_id=str(event.tenant_id)
         )
+        event_log.info("Dispatching event: {}", event_name)
+
+        # Handlers are independent, so their I/O runs concurrently
+        await asyncio.gather(*(self._safe_call(handler, event, event_log) for handler in handlers))
+
+    @staticmethod
+    async def _safe_call(handler: Callable, event: DomainEvent, event_log: Any) -> None:
+        """Run one handler, logging its failure instead of propagating it."""
+        try:
+            result = handler(event)
+            # Synchronous handlers have already finished
+            if isawaitable(result):
+                await result
+        except Exception as e:
+            event_log.opt(exception=e).error("Error in event handler for {}: {}", type(event).__name__, e)
+
+    def dispatch_background(self, event: DomainEvent) -> asyncio.Task:
+        """
+        Dispatch event without waiting for handlers to complete.
+
+        Events queued in the same event-loop tick are dispatched together by
+        one flush task, their handlers running concurrently. Each event is
+        still dispatched in a copy of the context it was queued from, so its
+        logs and spans belong to the request that raised it. The task is
+        referenced until it finishes so it cannot be garbage collected
+        mid-flight. Handler errors are logged by dispatch(); any other
+        failure is logged when the task completes.
+
+        Args:
+            event: Domain event
+
+        Returns:
+            The flush task that will dispatch the event
+        """
+        self._pending_events.append((event, contextvars.copy_context()))
+        if self._flush_task is None:
+            # The flush itself belongs to no single request
+            task = asyncio.create_task(self._flush_events(), context=contextvars.Context())
+            self._flush_task = task
+            self._background_tasks.add(task)
+            task.add_done_callback(self._on_background_done)
+        return self._flush_task
+
+    async def _flush_events(self) -> None:
+        """Dispatch all queued background events concurrently."""
+        events, self._pending_events = self._pending_events, []
+        self._flush_task = None
+        await asyncio.gather(*(
+            asyncio.create_task(self.dispatch(event), context=context)
+            for event, context in events
+        ))
 
-        for handler in handlers:
-            try:
-                await handler(event)
-            except Exception as e:
-                logger.error(
-                    f"Error in event handler for {event_type.__name__}: {e}",
-                    event_id=str(event.event_id),
-                    exc_info=True
-                )
+    def _on_background_done(self, task: asyncio.Task) -> None:
+        """Release a finished background dispatch and log unexpected failures."""
+        self._background_tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.opt(exception=exc).error("Background event dispatch failed: {}", exc)
 
 
 event_dispatcher = EventDispatcher()
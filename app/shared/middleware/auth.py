@@ -1,11 +1,32 @@
 """Authentication middleware."""
 from typing import Callable
-from uuid import UUID
 from fastapi import Request, Response, HTTPException, status
 from jose import JWTError
 from loguru import logger
-from app.shared.security.jwt import jwt_handler
-from app.shared.context import set_user_id, set_tenant_id, get_correlation_id
+from app.config import settings
+from app.shared.security.jwt_cache import authenticate_token
+from app.shared.context import set_user_context
+
+# Endpoints that do not require authentication
+_PUBLIC_PATHS = frozenset({
+    "/",
+    "/health",
+    "/ready",
+    "/live",
+    "/docs",
+    "/openapi.json",
+    "/redoc",
+    "/favicon.ico",
+    "/api/v1/auth/register",
+    "/api/v1/auth/login",
+    "/api/v1/auth/refresh"
+})
+
+# Public path prefixes (for docs assets, static files, well-known URIs)
+_PUBLIC_PATH_PREFIXES = (
+    "/.well-known/",  # Browser auto-requests (security.txt, etc.)
+    "/static/",       # Static files
+)
 
 
 async def auth_middleware(request: Request, call_next: Callable) -> Response:
@@ -20,35 +41,10 @@ async def auth_middleware(request: Request, call_next: Callable) -> Response:
     Returns:
         Response
     """
-    # Skip authentication for public endpoints
-    public_paths = [
-        "/",
-        "/health",
-        "/ready",
-        "/live",
-        "/docs",
-        "/openapi.json",
-        "/redoc",
-        "/favicon.ico",
-        "/api/v1/auth/register",
-        "/api/v1/auth/login",
-        "/api/v1/auth/refresh"
-    ]
-
-    # Public path prefixes (for docs assets, static files, well-known URIs)
-    public_prefixes = [
-        "/.well-known/",  # Browser auto-requests (security.txt, etc.)
-        "/static/",       # Static files
-    ]
-
     path = request.url.path
 
-    # Check exact match
-    if path in public_paths:
-        return await call_next(request)
-
-    # Check prefix match for browser auto-requests and static assets
-    if any(path.startswith(prefix) for prefix in public_prefixes):
+    # Skip authentication for public endpoints, browser auto-requests and static assets
+    if path in _PUBLIC_PATHS or path.startswith(_PUBLIC_PATH_PREFIXES):
         return await call_next(request)
 
     # Get authorization header
@@ -57,7 +53,6 @@ async def auth_middleware(request: Request, call_next: Callable) -> Response:
     if not auth_header or not auth_header.startswith("Bearer "):
         logger.warning(
             "Missing or invalid authorization header",
-            correlation_id=get_correlation_id(),
             path=request.url.path
         )
         raise HTTPException(
@@ -66,36 +61,35 @@ async def auth_middleware(request: Request, call_next: Callable) -> Response:
             headers={"WWW-Authenticate": "Bearer"}
         )
 
-    token = auth_header.split(" ")[1]
+    # Slice past "Bearer " rather than splitting into a list
+    token = auth_header[7:]
 
     try:
-        payload = jwt_handler.decode_token(token)
+        principal = authenticate_token(token)
+        user_id = principal.user_id
+        tenant_id = principal.tenant_id
 
         # Set user context
-        user_id = UUID(payload["sub"])
-        tenant_id = UUID(payload["tenant_id"])
-
-        set_user_id(user_id)
-        set_tenant_id(tenant_id)
+        set_user_context(user_id, tenant_id)
 
         # Store user info in request state for route handlers
         request.state.user_id = user_id
         request.state.tenant_id = tenant_id
-        request.state.roles = payload.get("roles", [])
-        request.state.permissions = payload.get("permissions", [])
-        request.state.department_id = UUID(payload["department_id"]) if payload.get("department_id") else None
-
-        logger.debug(
-            "User authenticated",
-            user_id=str(user_id),
-            tenant_id=str(tenant_id),
-            correlation_id=get_correlation_id()
-        )
+        request.state.roles = principal.roles
+        request.state.permissions = principal.permissions
+        request.state.department_id = principal.department_id
+
+        if settings.debug_logging:
+            logger.debug(
+                "User authenticated",
+                user_id=str(user_id),
+                tenant_id=str(tenant_id)
+            )
 
     except JWTError as e:
         logger.warning(
-            f"Invalid JWT token: {e}",
-            correlation_id=get_correlation_id(),
+            "Invalid JWT token: {}",
+            e,
             path=request.url.path
         )
         raise HTTPException(
@@ -104,10 +98,9 @@ async def auth_middleware(request: Request, call_next: Callable) -> Response:
             headers={"WWW-Authenticate": "Bearer"}
         )
     except Exception as e:
-        logger.error(
-            f"Authentication error: {e}",
-            correlation_id=get_correlation_id(),
-            exc_info=True
+        logger.opt(exception=e).error(
+            "Authentication error: {}",
+            e
         )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
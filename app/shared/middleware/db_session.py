@@ -0,0 +1,20 @@
+"""Per-request database session middleware."""
+from typing import Callable
+from fastapi import Request, Response
+from app.shared.database import request_session
+
+
+async def db_session_middleware(request: Request, call_next: Callable) -> Response:
+    """
+    Database session middleware.
+    Opens the session shared by middlewares and route dependencies for this request.
+
+    Args:
+        request: FastAPI request
+        call_next: Next middleware/handler
+
+    Returns:
+        Response
+    """
+    async with request_session():
+        return await call_next(request)
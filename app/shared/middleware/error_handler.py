@@ -1,10 +1,8 @@
 """Error handling middleware."""
 from typing import Callable
 from fastapi import Request, Response, status, HTTPException
-from fastapi.responses import JSONResponse
 from loguru import logger
-from app.shared.context import get_correlation_id
-from app.shared.response import create_error_response
+from app.shared.response import create_error_response, render_response
 
 
 async def error_handler_middleware(request: Request, call_next: Callable) -> Response:
@@ -25,23 +23,13 @@ async def error_handler_middleware(request: Request, call_next: Callable) -> Res
         # Re-raise HTTPException to let FastAPI's exception handler deal with it
         raise
     except Exception as e:
-        correlation_id = get_correlation_id()
-
-        logger.error(
-            f"Unhandled exception: {str(e)}",
-            correlation_id=correlation_id,
-            path=request.url.path,
-            method=request.method,
-            exc_info=True
-        )
+        # Correlation ID, method and path are bound by the logging middleware
+        logger.opt(exception=e).error("Unhandled exception: {}", e)
 
         error_response = create_error_response(
             error_message="An internal server error occurred",
             error_code="INTERNAL_SERVER_ERROR"
         )
 
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=error_response.model_dump()
-        )
+        return render_response(error_response, status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -1,10 +1,14 @@
 """Request logging middleware."""
 import time
+from datetime import datetime, UTC
 from typing import Callable
 from uuid import uuid4
 from fastapi import Request, Response
 from loguru import logger
-from app.shared.context import set_correlation_id
+from app.shared.context import set_request_info
+
+# Orchestrator probes: high-volume and uninteresting, so they are not logged
+_PROBE_PATHS = frozenset({"/health", "/ready", "/live"})
 
 
 async def logging_middleware(request: Request, call_next: Callable) -> Response:
@@ -18,33 +22,39 @@ async def logging_middleware(request: Request, call_next: Callable) -> Response:
     Returns:
         Response
     """
-    # Generate correlation ID
-    correlation_id = request.headers.get("X-Correlation-ID", str(uuid4()))
-    set_correlation_id(correlation_id)
+    path = request.scope["path"]
+    if path in _PROBE_PATHS:
+        return await call_next(request)
 
-    # Log request
+    # Generate correlation ID (only when the client did not send one) and
+    # stamp the request once for every response body built while handling it
+    correlation_id = request.headers.get("X-Correlation-ID") or str(uuid4())
     start_time = time.time()
-    logger.info(
-        f"Request started: {request.method} {request.url.path}",
-        correlation_id=correlation_id,
-        method=request.method,
-        path=request.url.path,
-        client_ip=request.client.host if request.client else None
-    )
-
-    # Process request
-    response = await call_next(request)
-
-    # Log response
-    duration = time.time() - start_time
-    logger.info(
-        f"Request completed: {request.method} {request.url.path}",
-        correlation_id=correlation_id,
-        method=request.method,
-        path=request.url.path,
-        status_code=response.status_code,
-        duration_ms=round(duration * 1000, 2)
-    )
+    set_request_info(correlation_id, datetime.fromtimestamp(start_time, UTC).isoformat())
+
+    # Every log emitted while handling the request carries these fields
+    method = request.method
+    with logger.contextualize(correlation_id=correlation_id, method=method, path=path):
+        # Log request
+        logger.info(
+            "Request started: {} {}",
+            method,
+            path,
+            client_ip=request.client.host if request.client else None
+        )
+
+        # Process request
+        response = await call_next(request)
+
+        # Log response
+        duration = time.time() - start_time
+        logger.info(
+            "Request completed: {} {}",
+            method,
+            path,
+            status_code=response.status_code,
+            duration_ms=round(duration * 1000, 2)
+        )
 
     # Add correlation ID to response headers
     response.headers["X-Correlation-ID"] = correlation_id
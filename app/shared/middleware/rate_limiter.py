@@ -3,10 +3,13 @@ import time
 from typing import Callable
 from fastapi import Request, Response, HTTPException, status
 from app.shared.cache.redis_client import redis_client
-from app.shared.context import get_tenant_id, get_correlation_id
+from app.shared.context import request_context
 from app.config import settings
 from loguru import logger
 
+# Orchestrator probes are never rate limited
+_PROBE_PATHS = frozenset({"/health", "/ready", "/live"})
+
 
 async def rate_limit_middleware(request: Request, call_next: Callable) -> Response:
     """
@@ -19,11 +22,11 @@ async def rate_limit_middleware(request: Request, call_next: Callable) -> Respon
     Returns:
         Response
     """
-    # Skip rate limiting for health check
-    if request.url.path == "/health":
+    # Skip rate limiting for health checks
+    if request.scope["path"] in _PROBE_PATHS:
         return await call_next(request)
 
-    tenant_id = get_tenant_id()
+    tenant_id = request_context.get().tenant_id
     if not tenant_id:
         return await call_next(request)
 
@@ -32,13 +35,9 @@ async def rate_limit_middleware(request: Request, call_next: Callable) -> Respon
     rate_limit_key = f"rate_limit:tenant:{tenant_id}:minute:{current_minute}"
 
     try:
-        # Increment counter
         if redis_client.redis:
-            count = await redis_client.redis.incr(rate_limit_key)
-
-            # Set expiry on first request in this minute
-            if count == 1:
-                await redis_client.redis.expire(rate_limit_key, 60)
+            # Increment counter, setting expiry on first request in this minute
+            count = await redis_client.incr_with_expiry(rate_limit_key, 60)
 
             # Check limit
             if count > settings.rate_limit_per_minute:
@@ -46,8 +45,7 @@ async def rate_limit_middleware(request: Request, call_next: Callable) -> Respon
                     "Rate limit exceeded",
                     tenant_id=str(tenant_id),
                     count=count,
-                    limit=settings.rate_limit_per_minute,
-                    correlation_id=get_correlation_id()
+                    limit=settings.rate_limit_per_minute
                 )
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -59,8 +57,7 @@ async def rate_limit_middleware(request: Request, call_next: Callable) -> Respon
         logger.critical(
             "Rate limit check failed - Redis unavailable",
             error=str(e),
-            tenant_id=str(tenant_id),
-            correlation_id=get_correlation_id()
+            tenant_id=str(tenant_id)
         )
 
     response = await call_next(request)
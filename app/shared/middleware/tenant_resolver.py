@@ -1,11 +1,31 @@
 """Tenant resolution middleware."""
-from typing import Callable, Optional
+import asyncio
+from typing import Callable, Dict, Optional
 from uuid import UUID
+from cachetools import TTLCache
 from fastapi import Request, Response, HTTPException, status
 from loguru import logger
-from app.shared.context import set_tenant_id, get_correlation_id
+from app.config import settings
+from app.shared.context import set_tenant_id, parse_uuid
 from app.shared.cache.redis_client import redis_client
 
+# Endpoints served without tenant resolution
+_TENANTLESS_PATHS = frozenset({"/", "/health", "/ready", "/live", "/docs", "/openapi.json", "/redoc"})
+
+# Reserved subdomains that shouldn't be treated as tenant identifiers
+_RESERVED_SUBDOMAINS = frozenset({"www", "api", "app", "admin", "mail", "smtp", "ftp"})
+
+# Process-local tier in front of Redis. Subdomain mappings rarely change, so a
+# short TTL bounds how long a deactivated tenant keeps resolving here.
+_local_tenants: TTLCache = TTLCache(maxsize=4096, ttl=60)
+
+# Subdomain lookups currently hitting the database, keyed by subdomain
+_inflight: Dict[str, "asyncio.Future[Optional[UUID]]"] = {}
+
+
+class _LeaderCancelled(Exception):
+    """The request doing a shared tenant lookup was cancelled before finishing."""
+
 
 def extract_subdomain(host: str) -> Optional[str]:
     """
@@ -24,24 +44,21 @@ def extract_subdomain(host: str) -> Optional[str]:
         Subdomain string or None if not found/applicable
     """
     # Remove port if present
-    host = host.split(":")[0]
+    host = host.partition(":")[0]
 
     # Skip localhost - no subdomain resolution
     if host == "localhost" or host == "127.0.0.1":
         return None
 
-    parts = host.split(".")
-
-    # Need at least 3 parts for subdomain (e.g., tenant.example.com)
-    if len(parts) < 3:
+    # Need at least 3 labels for subdomain (e.g., tenant.example.com);
+    # partition avoids building a list of every label
+    label, _, rest = host.partition(".")
+    if "." not in rest:
         return None
 
-    # Reserved subdomains that shouldn't be treated as tenant identifiers
-    reserved_subdomains = {"www", "api", "app", "admin", "mail", "smtp", "ftp"}
-
-    subdomain = parts[0].lower()
+    subdomain = label.lower()
 
-    if subdomain in reserved_subdomains:
+    if subdomain in _RESERVED_SUBDOMAINS:
         return None
 
     return subdomain
@@ -57,37 +74,72 @@ async def resolve_tenant_from_subdomain(subdomain: str) -> Optional[UUID]:
     Returns:
         Tenant UUID or None if not found
     """
-    # Try cache first
+    # Try the in-process cache, then Redis
+    tenant_id = _local_tenants.get(subdomain)
+    if tenant_id is not None:
+        return tenant_id
+
     cache_key = f"tenant:subdomain:{subdomain}"
 
     try:
         if redis_client.redis:
             cached_tenant_id = await redis_client.redis.get(cache_key)
             if cached_tenant_id:
-                logger.debug(
-                    "Tenant resolved from cache",
-                    subdomain=subdomain,
-                    tenant_id=cached_tenant_id.decode() if isinstance(cached_tenant_id, bytes) else cached_tenant_id,
-                    correlation_id=get_correlation_id()
-                )
-                return UUID(cached_tenant_id.decode() if isinstance(cached_tenant_id, bytes) else cached_tenant_id)
+                if settings.debug_logging:
+                    logger.debug(
+                        "Tenant resolved from cache",
+                        subdomain=subdomain,
+                        tenant_id=cached_tenant_id.decode() if isinstance(cached_tenant_id, bytes) else cached_tenant_id
+                    )
+                tenant_id = parse_uuid(cached_tenant_id.decode() if isinstance(cached_tenant_id, bytes) else cached_tenant_id)
+                _local_tenants[subdomain] = tenant_id
+                return tenant_id
     except Exception as e:
         logger.warning(
             "Failed to fetch tenant from cache",
             subdomain=subdomain,
-            error=str(e),
-            correlation_id=get_correlation_id()
+            error=str(e)
         )
 
-    # Fall back to database lookup
+    # Fall back to database lookup; concurrent misses for one subdomain share it
+    leader = _inflight.get(subdomain)
+    if leader is not None:
+        try:
+            return await asyncio.shield(leader)
+        except _LeaderCancelled:
+            return await _load_tenant_from_database(subdomain, cache_key)
+
+    shared: "asyncio.Future[Optional[UUID]]" = asyncio.get_running_loop().create_future()
+    _inflight[subdomain] = shared
+    try:
+        tenant_id = await _load_tenant_from_database(subdomain, cache_key)
+    except BaseException:
+        shared.set_exception(_LeaderCancelled())
+        shared.exception()  # Mark retrieved in case no request was waiting
+        raise
+    finally:
+        del _inflight[subdomain]
+    shared.set_result(tenant_id)
+    if tenant_id is not None:
+        _local_tenants[subdomain] = tenant_id
+    return tenant_id
+
+
+async def _load_tenant_from_database(subdomain: str, cache_key: str) -> Optional[UUID]:
+    """Look up an active tenant by subdomain and cache the mapping."""
     try:
         from app.tenant.repository import TenantRepository
-        from sqlalchemy.ext.asyncio import AsyncSession
-        from app.shared.database import engine
+        from app.shared.database import session_scope
 
-        async with AsyncSession(engine) as session:
+        async with session_scope() as session:
             repository = TenantRepository(session)
-            tenant = await repository.get_tenant_by_subdomain(subdomain)
+            try:
+                tenant = await repository.get_tenant_by_subdomain(subdomain)
+            except Exception:
+                # The session is shared with the route; don't leave its
+                # transaction aborted when falling back to the header
+                await session.rollback()
+                raise
 
             if tenant and tenant.is_active:
                 tenant_id = tenant.id
@@ -104,23 +156,21 @@ async def resolve_tenant_from_subdomain(subdomain: str) -> Optional[UUID]:
                     logger.warning(
                         "Failed to cache tenant subdomain mapping",
                         subdomain=subdomain,
-                        error=str(cache_error),
-                        correlation_id=get_correlation_id()
+                        error=str(cache_error)
                     )
 
-                logger.debug(
-                    "Tenant resolved from database",
-                    subdomain=subdomain,
-                    tenant_id=str(tenant_id),
-                    correlation_id=get_correlation_id()
-                )
+                if settings.debug_logging:
+                    logger.debug(
+                        "Tenant resolved from database",
+                        subdomain=subdomain,
+                        tenant_id=str(tenant_id)
+                    )
                 return tenant_id
     except Exception as e:
         logger.error(
             "Failed to resolve tenant from database",
             subdomain=subdomain,
-            error=str(e),
-            correlation_id=get_correlation_id()
+            error=str(e)
         )
 
     return None
@@ -143,8 +193,7 @@ async def tenant_resolver_middleware(request: Request, call_next: Callable) -> R
         Response
     """
     # Skip tenant resolution for public endpoints
-    public_paths = ["/", "/health", "/ready", "/live", "/docs", "/openapi.json", "/redoc"]
-    if request.url.path in public_paths:
+    if request.url.path in _TENANTLESS_PATHS:
         return await call_next(request)
 
     tenant_id: Optional[UUID] = None
@@ -158,12 +207,12 @@ async def tenant_resolver_middleware(request: Request, call_next: Callable) -> R
         tenant_id = await resolve_tenant_from_subdomain(subdomain)
         if tenant_id:
             resolution_method = "subdomain"
-            logger.debug(
-                "Tenant resolved from subdomain",
-                subdomain=subdomain,
-                tenant_id=str(tenant_id),
-                correlation_id=get_correlation_id()
-            )
+            if settings.debug_logging:
+                logger.debug(
+                    "Tenant resolved from subdomain",
+                    subdomain=subdomain,
+                    tenant_id=str(tenant_id)
+                )
 
     # Strategy 2: Try to get tenant_id from header
     if not tenant_id:
@@ -171,18 +220,17 @@ async def tenant_resolver_middleware(request: Request, call_next: Callable) -> R
 
         if tenant_id_str:
             try:
-                tenant_id = UUID(tenant_id_str)
+                tenant_id = parse_uuid(tenant_id_str)
                 resolution_method = "header"
-                logger.debug(
-                    "Tenant resolved from header",
-                    tenant_id=str(tenant_id),
-                    correlation_id=get_correlation_id()
-                )
+                if settings.debug_logging:
+                    logger.debug(
+                        "Tenant resolved from header",
+                        tenant_id=str(tenant_id)
+                    )
             except ValueError:
                 logger.warning(
                     "Invalid tenant ID in header",
-                    tenant_id=tenant_id_str,
-                    correlation_id=get_correlation_id()
+                    tenant_id=tenant_id_str
                 )
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -199,8 +247,7 @@ async def tenant_resolver_middleware(request: Request, call_next: Callable) -> R
         logger.info(
             "Tenant context set",
             tenant_id=str(tenant_id),
-            resolution_method=resolution_method,
-            correlation_id=get_correlation_id()
+            resolution_method=resolution_method
         )
 
     response = await call_next(request)
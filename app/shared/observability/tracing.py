@@ -19,7 +19,12 @@ def setup_tracing(
     service_name: str = "task-management-system",
     service_version: str = "1.0.0",
     environment: str = "development",
-    otlp_endpoint: Optional[str] = None
+    otlp_endpoint: Optional[str] = None,
+    console_traces: bool = False,
+    max_queue_size: Optional[int] = None,
+    max_export_batch_size: Optional[int] = None,
+    schedule_delay_millis: Optional[int] = None,
+    export_timeout_millis: Optional[int] = None
 ) -> trace.Tracer:
     """
     Setup OpenTelemetry distributed tracing.
@@ -28,7 +33,15 @@ def setup_tracing(
         service_name: Name of the service for tracing
         service_version: Version of the service
         environment: Deployment environment (development, staging, production)
-        otlp_endpoint: OTLP exporter endpoint (optional, defaults to console exporter)
+        otlp_endpoint: OTLP/gRPC exporter endpoint (optional; without it spans are not exported)
+        console_traces: Print spans to stdout when no OTLP endpoint is set (debugging only)
+        max_queue_size: Spans buffered before new ones are dropped
+        max_export_batch_size: Spans sent per export call
+        schedule_delay_millis: Delay between scheduled exports
+        export_timeout_millis: Timeout for a single export call
+
+    Batch processor arguments left as None fall back to the SDK's
+    OTEL_BSP_* environment variables and built-in defaults.
 
     Returns:
         Configured tracer instance
@@ -45,23 +58,40 @@ def setup_tracing(
     # Create tracer provider
     provider = TracerProvider(resource=resource)
 
-    # Configure exporter based on environment
+    # Configure exporter. The console exporter writes every span to stdout
+    # synchronously and is opt-in; without an exporter spans still carry
+    # trace IDs for logs and propagation but are not shipped anywhere.
+    exporter = None
     if otlp_endpoint:
         try:
+            import grpc
             from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-            exporter = OTLPSpanExporter(endpoint=otlp_endpoint)
-            logger.info(f"OpenTelemetry configured with OTLP exporter: {otlp_endpoint}")
+            # One gRPC channel per exporter, reused across batches; gzip
+            # shrinks the many small spans per batch
+            exporter = OTLPSpanExporter(
+                endpoint=otlp_endpoint,
+                compression=grpc.Compression.Gzip,
+                timeout=(export_timeout_millis or 10000) // 1000
+            )
+            logger.info("OpenTelemetry configured with OTLP exporter: {}", otlp_endpoint)
         except ImportError:
-            logger.warning("OTLP exporter not available, falling back to console exporter")
-            exporter = ConsoleSpanExporter()
-    else:
-        # Use console exporter for development/testing
+            logger.warning("OTLP exporter not available, spans will not be exported")
+    elif console_traces:
         exporter = ConsoleSpanExporter()
         logger.info("OpenTelemetry configured with console exporter")
+    else:
+        logger.info("OpenTelemetry configured without an exporter")
 
     # Add batch processor for performance
-    processor = BatchSpanProcessor(exporter)
-    provider.add_span_processor(processor)
+    if exporter is not None:
+        processor = BatchSpanProcessor(
+            exporter,
+            max_queue_size=max_queue_size,
+            max_export_batch_size=max_export_batch_size,
+            schedule_delay_millis=schedule_delay_millis,
+            export_timeout_millis=export_timeout_millis
+        )
+        provider.add_span_processor(processor)
 
     # Set global tracer provider
     trace.set_tracer_provider(provider)
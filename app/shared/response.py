@@ -1,8 +1,10 @@
 """Standard API response wrapper."""
 from typing import Any, Optional, Dict, Generic, TypeVar, List
 from datetime import datetime, UTC
+from fastapi import status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-from app.shared.context import get_correlation_id
+from app.shared.context import request_context
 
 T = TypeVar('T')
 
@@ -37,6 +39,17 @@ class StandardResponse(BaseModel, Generic[T]):
         arbitrary_types_allowed = True
 
 
+def _response_metadata() -> Dict[str, Any]:
+    """Timestamp and correlation ID for the current request."""
+    ctx = request_context.get()
+    return {
+        # Set once per request by the logging middleware; probes and code
+        # running outside a request fall back to the current time
+        "timestamp": ctx.timestamp or datetime.now(UTC).isoformat(),
+        "correlation_id": ctx.correlation_id
+    }
+
+
 def create_success_response(
     data: Any,
     pagination: Optional[PaginationMetadata] = None
@@ -51,15 +64,14 @@ def create_success_response(
     Returns:
         StandardResponse with success=True
     """
-    metadata: Dict[str, Any] = {
-        "timestamp": datetime.now(UTC).isoformat(),
-        "correlation_id": get_correlation_id()
-    }
+    metadata = _response_metadata()
 
     if pagination:
-        metadata["pagination"] = pagination.model_dump()
+        metadata["pagination"] = dict(pagination)
 
-    return StandardResponse(
+    # The builders' arguments are already typed, so skip re-validating them;
+    # render_response dumps the envelope once without a response_model pass
+    return StandardResponse.model_construct(
         success=True,
         data=data,
         error=None,
@@ -81,17 +93,14 @@ def create_error_response(
     Returns:
         StandardResponse with success=False
     """
-    return StandardResponse(
+    return StandardResponse.model_construct(
         success=False,
         data=None,
-        error=ErrorDetail(
+        error=ErrorDetail.model_construct(
             code=error_code,
             message=error_message
         ),
-        metadata={
-            "timestamp": datetime.now(UTC).isoformat(),
-            "correlation_id": get_correlation_id()
-        }
+        metadata=_response_metadata()
     )
 
 
@@ -115,7 +124,7 @@ def create_paginated_response(
     """
     total_pages = (total_items + page_size - 1) // page_size if page_size > 0 else 0
 
-    pagination = PaginationMetadata(
+    pagination = PaginationMetadata.model_construct(
         page=page,
         page_size=page_size,
         total_items=total_items,
@@ -127,3 +136,21 @@ def create_paginated_response(
     return create_success_response(data=items, pagination=pagination)
 
 
+def render_response(response: StandardResponse, status_code: int = status.HTTP_200_OK) -> ORJSONResponse:
+    """
+    Render a standardized response as JSON.
+
+    Routes return this rather than the model: FastAPI would otherwise dump
+    the envelope, re-validate it against the response_model and serialize it
+    again. Here it is dumped once and orjson encodes the UUIDs, datetimes and
+    enums left in the dump natively. Routes document the envelope through
+    `responses={...: {"model": StandardResponse}}` instead.
+
+    Args:
+        response: Envelope built by one of the create_*_response helpers
+        status_code: HTTP status code
+
+    Returns:
+        ORJSONResponse with the serialized envelope
+    """
+    return ORJSONResponse(content=response.model_dump(), status_code=status_code)
@@ -1,6 +1,6 @@
 """Authorization utilities and decorators."""
 from enum import Enum
-from typing import List, Optional
+from typing import Collection, Dict, Iterable, List, Optional
 from uuid import UUID
 from fastapi import HTTPException, status
 
@@ -28,12 +28,60 @@ class Permission(str, Enum):
     TENANT_CONFIGURE = "tenant.configure"
 
 
-def check_permission(user_permissions: List[str], required_permission: str) -> bool:
+# Bit positions for the compact roles_mask/permissions_mask columns on User.
+# Bits follow enum declaration order: only ever append new members.
+ROLE_BITS: Dict[str, int] = {role.value: 1 << index for index, role in enumerate(Role)}
+PERMISSION_BITS: Dict[str, int] = {perm.value: 1 << index for index, perm in enumerate(Permission)}
+
+
+def encode_mask(values: Iterable[str], bits: Dict[str, int]) -> int:
+    """
+    Encode role or permission names as a bitmask.
+
+    Args:
+        values: Role or permission names
+        bits: ROLE_BITS or PERMISSION_BITS
+
+    Returns:
+        Bitmask with one bit set per value
+
+    Raises:
+        ValueError: If a value is not a known role/permission
+    """
+    mask = 0
+    for value in values:
+        try:
+            mask |= bits[value]
+        except KeyError:
+            raise ValueError(f"Unknown role or permission: {value}") from None
+    return mask
+
+
+def decode_mask(mask: int, bits: Dict[str, int]) -> List[str]:
+    """
+    Decode a bitmask back into role or permission names.
+
+    Args:
+        mask: Bitmask produced by encode_mask
+        bits: ROLE_BITS or PERMISSION_BITS
+
+    Returns:
+        Names in enum declaration order
+    """
+    return [value for value, bit in bits.items() if mask & bit]
+
+
+# Plain-string keys for the checks on every resource access
+_TENANT_ADMIN = Role.TENANT_ADMIN.value
+_TASKS_READ = Permission.TASKS_READ.value
+
+
+def check_permission(user_permissions: Collection[str], required_permission: str) -> bool:
     """
     Check if user has required permission.
 
     Args:
-        user_permissions: User's permissions
+        user_permissions: User's permissions (a frozenset on authenticated requests)
         required_permission: Required permission
 
     Returns:
@@ -42,12 +90,12 @@ def check_permission(user_permissions: List[str], required_permission: str) -> b
     return required_permission in user_permissions
 
 
-def check_role(user_roles: List[str], required_role: str) -> bool:
+def check_role(user_roles: Collection[str], required_role: str) -> bool:
     """
     Check if user has required role.
 
     Args:
-        user_roles: User's roles
+        user_roles: User's roles (a frozenset on authenticated requests)
         required_role: Required role
 
     Returns:
@@ -58,8 +106,8 @@ def check_role(user_roles: List[str], required_role: str) -> bool:
 
 def check_resource_access(
     user_id: UUID,
-    user_roles: List[str],
-    user_permissions: List[str],
+    user_roles: Collection[str],
+    user_permissions: Collection[str],
     resource_owner_id: Optional[UUID],
     resource_assigned_to_id: Optional[UUID],
     user_department_id: Optional[UUID],
@@ -81,7 +129,7 @@ def check_resource_access(
         True if user has access
     """
     # Tenant admin has access to everything
-    if Role.TENANT_ADMIN in user_roles:
+    if _TENANT_ADMIN in user_roles:
         return True
 
     # Owner has access
@@ -97,14 +145,14 @@ def check_resource_access(
         user_department_id
         and resource_department_id
         and user_department_id == resource_department_id
-        and Permission.TASKS_READ in user_permissions
+        and _TASKS_READ in user_permissions
     ):
         return True
 
     return False
 
 
-def require_permission(required_permission: str, user_permissions: List[str]) -> None:
+def require_permission(required_permission: str, user_permissions: Collection[str]) -> None:
     """
     Require specific permission.
 
@@ -122,7 +170,7 @@ def require_permission(required_permission: str, user_permissions: List[str]) ->
         )
 
 
-def require_role(required_role: str, user_roles: List[str]) -> None:
+def require_role(required_role: str, user_roles: Collection[str]) -> None:
     """
     Require specific role.
 
@@ -1,11 +1,49 @@
 """JWT token utilities."""
-from datetime import datetime, timedelta, UTC
-from typing import Dict, Any, Optional
+import base64
+import time
+from functools import lru_cache
+from typing import Dict, Any, Optional, Union
 from uuid import UUID
-from jose import jwt, JWTError
+import orjson
+from jose import jwk, jwt, JWTError
+from jose.backends.base import Key
 from app.config import settings
 from loguru import logger
 
+_ACCESS_TOKEN_TTL_SECONDS = settings.access_token_expire_minutes * 60
+_REFRESH_TOKEN_TTL_SECONDS = settings.refresh_token_expire_days * 86400
+
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding (RFC 7515)."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+@lru_cache(maxsize=8)
+def _header_segment(algorithm: str) -> bytes:
+    """Encoded JOSE header; identical for every token signed with an algorithm."""
+    return _b64url(orjson.dumps({"alg": algorithm, "typ": "JWT"}))
+
+
+@lru_cache(maxsize=8)
+def _signing_key(private_key: str, algorithm: str) -> Key:
+    """Parsed signing key, built once per key/algorithm instead of per token."""
+    return jwk.construct(private_key, algorithm)
+
+
+@lru_cache(maxsize=8)
+def _verifying_key(public_key: str, algorithm: str) -> Key:
+    """Parsed verification key, built once per key/algorithm instead of per token."""
+    return jwk.construct(public_key, algorithm)
+
+
+def _encode(payload: Dict[str, Any]) -> str:
+    """Serialize and sign a JWT using the cached header and signing key."""
+    algorithm = settings.jwt_algorithm
+    signing_input = _header_segment(algorithm) + b"." + _b64url(orjson.dumps(payload))
+    signature = _signing_key(settings.jwt_private_key, algorithm).sign(signing_input)
+    return (signing_input + b"." + _b64url(signature)).decode()
+
 
 class JWTHandler:
     """JWT token handler for encoding and decoding tokens."""
@@ -33,8 +71,8 @@ class JWTHandler:
         Returns:
             JWT access token
         """
-        now = datetime.now(UTC).replace(tzinfo=None)
-        expire = now + timedelta(minutes=settings.access_token_expire_minutes)
+        now = int(time.time())
+        expire = now + _ACCESS_TOKEN_TTL_SECONDS
 
         payload: Dict[str, Any] = {
             "sub": str(user_id),
@@ -49,12 +87,7 @@ class JWTHandler:
         }
 
         try:
-            token = jwt.encode(
-                payload,
-                settings.jwt_private_key,
-                algorithm=settings.jwt_algorithm
-            )
-            return token
+            return _encode(payload)
         except Exception as e:
             logger.error(f"Failed to create access token: {e}")
             raise
@@ -63,7 +96,7 @@ class JWTHandler:
     def create_refresh_token(
         user_id: UUID,
         tenant_id: UUID,
-        jti: str
+        jti: Union[UUID, str]
     ) -> str:
         """
         Create refresh token.
@@ -76,25 +109,20 @@ class JWTHandler:
         Returns:
             JWT refresh token
         """
-        now = datetime.now(UTC).replace(tzinfo=None)
-        expire = now + timedelta(days=settings.refresh_token_expire_days)
+        now = int(time.time())
+        expire = now + _REFRESH_TOKEN_TTL_SECONDS
 
         payload: Dict[str, Any] = {
             "sub": str(user_id),
             "tenant_id": str(tenant_id),
-            "jti": jti,
+            "jti": str(jti),
             "iat": now,
             "exp": expire,
             "type": "refresh"
         }
 
         try:
-            token = jwt.encode(
-                payload,
-                settings.jwt_private_key,
-                algorithm=settings.jwt_algorithm
-            )
-            return token
+            return _encode(payload)
         except Exception as e:
             logger.error(f"Failed to create refresh token: {e}")
             raise
@@ -116,7 +144,7 @@ class JWTHandler:
         try:
             payload = jwt.decode(
                 token,
-                settings.jwt_public_key,
+                _verifying_key(settings.jwt_public_key, settings.jwt_algorithm),
                 algorithms=[settings.jwt_algorithm]
             )
             return payload
@@ -0,0 +1,121 @@
+"""In-process cache of verified JWT payloads."""
+import hashlib
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, FrozenSet, Mapping, Optional
+from uuid import UUID
+from cachetools import TLRUCache
+from app.shared.context import parse_uuid
+from app.shared.security.jwt import jwt_handler
+
+# Upper bound on how long a verified payload is reused
+MAX_CACHE_TTL_SECONDS = 3600
+
+
+def _expires_at(_key: bytes, payload: Mapping[str, Any], now: float) -> float:
+    """Keep an entry until the token's own "exp", capped at MAX_CACHE_TTL_SECONDS."""
+    return min(payload["exp"], now + MAX_CACHE_TTL_SECONDS)
+
+
+# Verified payloads keyed by a BLAKE2b digest of the raw token. Only
+# successful verifications are stored, and each entry expires with its token.
+# Entries are shared by every request carrying the token, so they are read-only.
+_verified_tokens: TLRUCache = TLRUCache(maxsize=100_000, ttu=_expires_at, timer=time.time)
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Identity parsed from a verified access token."""
+    user_id: UUID
+    tenant_id: UUID
+    # Sets, so authorization checks are constant-time membership tests
+    roles: FrozenSet[str]
+    permissions: FrozenSet[str]
+    department_id: Optional[UUID]
+    expires_at: float
+
+
+def _principal_expires_at(_key: bytes, principal: Principal, now: float) -> float:
+    """Keep a principal until its token expires, capped at MAX_CACHE_TTL_SECONDS."""
+    return min(principal.expires_at, now + MAX_CACHE_TTL_SECONDS)
+
+
+# Parsed principals for the access tokens seen most recently, so a client
+# reusing its bearer token skips payload lookups and UUID parsing.
+_principals: TLRUCache = TLRUCache(maxsize=4096, ttu=_principal_expires_at, timer=time.time)
+
+
+def _cache_key(token: str) -> bytes:
+    """Return the cache key for a raw token."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _read_only(payload: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Return a read-only view of a payload, with list claims turned into tuples."""
+    return MappingProxyType({
+        claim: tuple(value) if isinstance(value, list) else value
+        for claim, value in payload.items()
+    })
+
+
+def decode_token_cached(token: str) -> Mapping[str, Any]:
+    """
+    Decode and verify a JWT, reusing a previous successful verification.
+
+    Args:
+        token: JWT token
+
+    Returns:
+        Decoded token payload (read-only; shared with other callers)
+
+    Raises:
+        JWTError: If token is invalid or expired
+    """
+    key = _cache_key(token)
+    payload = _verified_tokens.get(key)
+    if payload is not None:
+        return payload
+
+    payload = _read_only(jwt_handler.decode_token(token))
+    _verified_tokens[key] = payload
+    return payload
+
+
+def authenticate_token(token: str) -> Principal:
+    """
+    Verify an access token and return its parsed principal.
+
+    Args:
+        token: JWT token
+
+    Returns:
+        Principal built from the token claims
+
+    Raises:
+        JWTError: If token is invalid or expired
+    """
+    key = _cache_key(token)
+    principal = _principals.get(key)
+    if principal is not None:
+        return principal
+
+    payload = decode_token_cached(token)
+    department_id = payload.get("department_id")
+    principal = Principal(
+        user_id=parse_uuid(payload["sub"]),
+        tenant_id=parse_uuid(payload["tenant_id"]),
+        roles=frozenset(payload.get("roles", ())),
+        permissions=frozenset(payload.get("permissions", ())),
+        department_id=parse_uuid(department_id) if department_id else None,
+        expires_at=payload["exp"]
+    )
+    _principals[key] = principal
+    return principal
+
+
+def evict_token(token: str) -> None:
+    """Drop a token from the verification caches (e.g. once it is revoked)."""
+    key = _cache_key(token)
+    _verified_tokens.pop(key, None)
+    _principals.pop(key, None)
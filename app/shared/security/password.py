@@ -1,20 +1,139 @@
 """Password hashing and validation utilities."""
-import re
+import os
+import asyncio
 import hashlib
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, FrozenSet, Optional, Tuple
 import httpx
-from passlib.context import CryptContext
+from cachetools import LRUCache, TTLCache
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from loguru import logger
+from app.config import settings
 
 
-pwd_context = CryptContext(
-    schemes=["argon2"],
-    deprecated="auto",
-    argon2__memory_cost=65536,
-    argon2__time_cost=3,
-    argon2__parallelism=4
+# Argon2id via argon2-cffi (native C reference implementation). Costs come from
+# settings; raising them upgrades existing hashes on the next successful login.
+password_hasher = PasswordHasher(
+    time_cost=settings.argon2_time_cost,
+    memory_cost=settings.argon2_memory_cost,
+    parallelism=settings.argon2_parallelism,
+    hash_len=32,
+    salt_len=16
 )
 
+# Argon2 releases the GIL while hashing, so a dedicated thread pool runs
+# hashes in parallel across cores without starving the default executor.
+_hash_pool = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 4,
+    thread_name_prefix="password-hash"
+)
+
+
+# HaveIBeenPwned k-anonymity responses: SHA-1 prefix -> breached suffixes.
+# There are only 16^5 prefixes, so repeat registrations hit this cache often.
+_pwned_suffix_cache: TTLCache = TTLCache(maxsize=4096, ttl=86400)
+
+_pwned_inflight: Dict[str, "asyncio.Future[Optional[FrozenSet[str]]]"] = {}
+
+
+async def _fetch_pwned_suffixes(prefix: str) -> Optional[FrozenSet[str]]:
+    """
+    Fetch breached SHA-1 suffixes for a prefix from HaveIBeenPwned.
+
+    Args:
+        prefix: First 5 hex characters of the SHA-1 hash
+
+    Returns:
+        Breached suffixes, or None if the API could not be queried
+    """
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.get(
+                f"https://api.pwnedpasswords.com/range/{prefix}",
+                headers={"Add-Padding": "true"}
+            )
+
+            if response.status_code != 200:
+                logger.warning(f"HaveIBeenPwned API returned status {response.status_code}")
+                return None
+
+            # Padding entries carry a count of 0 and are not real breaches
+            suffixes = frozenset(
+                hash_suffix
+                for hash_suffix, _, count in (
+                    line.partition(":") for line in response.text.splitlines()
+                )
+                if count.strip() not in ("", "0")
+            )
+            _pwned_suffix_cache[prefix] = suffixes
+            return suffixes
+    except Exception as e:
+        logger.error(f"Error checking compromised password: {e}")
+        return None
+
+
+# Character classes a password must contain, as bit flags
+_UPPER, _LOWER, _DIGIT, _SPECIAL = 1, 2, 4, 8
+_ALL_CLASSES = _UPPER | _LOWER | _DIGIT | _SPECIAL
+
+
+def _build_class_table() -> bytes:
+    """Map each byte value to the class flags of the ASCII character it encodes."""
+    table = bytearray(256)
+    for chars, flag in (
+        (b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", _UPPER),
+        (b"abcdefghijklmnopqrstuvwxyz", _LOWER),
+        (b"0123456789", _DIGIT),
+        (b'!@#$%^&*(),.?":{}|<>', _SPECIAL),
+    ):
+        for byte in chars:
+            table[byte] = flag
+    return bytes(table)
+
+
+# UTF-8 continuation and lead bytes are >= 0x80 and map to 0
+_CLASS_TABLE = _build_class_table()
+
+# Character-class rules in reporting order
+_STRENGTH_RULES = (
+    (_UPPER, "Password must contain at least one uppercase letter"),
+    (_LOWER, "Password must contain at least one lowercase letter"),
+    (_DIGIT, "Password must contain at least one number"),
+    (_SPECIAL, "Password must contain at least one special character"),
+)
+
+
+def _character_classes(password: str) -> int:
+    """Return the class flags present in a password, in one pass over its bytes."""
+    flags = 0
+    # translate() rewrites every byte to its flags in C; the set has at most five members
+    for class_flags in set(password.encode("utf-8", "surrogatepass").translate(_CLASS_TABLE)):
+        flags |= class_flags
+    # Non-ASCII decimal digits also count as numbers
+    if not flags & _DIGIT and not password.isascii() and any(ch.isdecimal() for ch in password):
+        flags |= _DIGIT
+    return flags
+
+
+def _check_password_strength(password: str) -> Tuple[bool, Optional[str]]:
+    """Run the password strength rules (see validate_password_strength)."""
+    if len(password) < 12:
+        return False, "Password must be at least 12 characters long"
+
+    flags = _character_classes(password)
+    if flags != _ALL_CLASSES:
+        for flag, message in _STRENGTH_RULES:
+            if not flags & flag:
+                return False, message
+
+    return True, None
+
+
+# Recent strength-check results, so retried submissions skip the rule scans
+_STRENGTH_CACHE_KEY = os.urandom(16)
+_strength_results: LRUCache = LRUCache(maxsize=1024)
+
 
 class PasswordHandler:
     """Password hashing and validation handler."""
@@ -30,7 +149,7 @@ class PasswordHandler:
         Returns:
             Hashed password
         """
-        return pwd_context.hash(password)
+        return password_hasher.hash(password)
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -44,35 +163,78 @@ class PasswordHandler:
         Returns:
             True if password matches
         """
-        return pwd_context.verify(plain_password, hashed_password)
+        try:
+            return password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
 
     @staticmethod
-    def validate_password_strength(password: str) -> tuple[bool, Optional[str]]:
+    async def hash_password_async(password: str) -> str:
         """
-        Validate password meets strength requirements.
+        Hash password on the password-hashing pool, off the event loop.
 
         Args:
-            password: Password to validate
+            password: Plain text password
 
         Returns:
-            Tuple of (is_valid, error_message)
+            Hashed password
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_pool, PasswordHandler.hash_password, password)
+
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
         """
-        if len(password) < 12:
-            return False, "Password must be at least 12 characters long"
+        Verify password on the password-hashing pool, off the event loop.
+
+        Args:
+            plain_password: Plain text password
+            hashed_password: Hashed password
 
-        if not re.search(r"[A-Z]", password):
-            return False, "Password must contain at least one uppercase letter"
+        Returns:
+            True if password matches
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _hash_pool, PasswordHandler.verify_password, plain_password, hashed_password
+        )
+
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """
+        Check whether a stored hash was produced with outdated parameters.
+
+        Args:
+            hashed_password: Hashed password
 
-        if not re.search(r"[a-z]", password):
-            return False, "Password must contain at least one lowercase letter"
+        Returns:
+            True if the hash should be regenerated on next successful login
+        """
+        try:
+            return password_hasher.check_needs_rehash(hashed_password)
+        except InvalidHashError:
+            return True
 
-        if not re.search(r"\d", password):
-            return False, "Password must contain at least one number"
+    @staticmethod
+    def validate_password_strength(password: str) -> tuple[bool, Optional[str]]:
+        """
+        Validate password meets strength requirements.
 
-        if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
-            return False, "Password must contain at least one special character"
+        Args:
+            password: Password to validate
 
-        return True, None
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        # Keyed by a per-process BLAKE2b digest so plaintext is never retained
+        key = hashlib.blake2b(
+            password.encode("utf-8", "surrogatepass"), digest_size=16, key=_STRENGTH_CACHE_KEY
+        ).digest()
+        result = _strength_results.get(key)
+        if result is None:
+            result = _check_password_strength(password)
+            _strength_results[key] = result
+        return result
 
     @staticmethod
     async def check_compromised_password(password: str) -> bool:
@@ -91,30 +253,18 @@ class PasswordHandler:
         prefix = sha1_hash[:5]
         suffix = sha1_hash[5:]
 
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"https://api.pwnedpasswords.com/range/{prefix}",
-                    headers={"Add-Padding": "true"}
-                )
-
-                if response.status_code != 200:
-                    logger.warning(f"HaveIBeenPwned API returned status {response.status_code}")
-                    return False
-
-                # Check if our suffix appears in the response
-                hashes = response.text.splitlines()
-                for hash_line in hashes:
-                    hash_suffix = hash_line.split(":")[0]
-                    if hash_suffix == suffix:
-                        return True
-
-                return False
-        except Exception as e:
-            logger.error(f"Error checking compromised password: {e}")
-            # Don't block registration if API is down
-            return False
+        suffixes: Optional[FrozenSet[str]] = _pwned_suffix_cache.get(prefix)
+        if suffixes is None:
+            # Concurrent checks for the same prefix share one HTTP request
+            fetch = _pwned_inflight.get(prefix)
+            if fetch is None:
+                fetch = asyncio.ensure_future(_fetch_pwned_suffixes(prefix))
+                _pwned_inflight[prefix] = fetch
+                fetch.add_done_callback(lambda _: _pwned_inflight.pop(prefix, None))
+            suffixes = await asyncio.shield(fetch)
 
+        # Don't block registration if API is down
+        return suffixes is not None and suffix in suffixes
 
 password_handler = PasswordHandler()
 
@@ -0,0 +1,64 @@
+"""TOTP (RFC 6238) verification utilities."""
+import base64
+import hashlib
+import hmac
+import struct
+import time
+from functools import lru_cache
+from typing import Optional
+
+TOTP_INTERVAL = 30
+TOTP_DIGITS = 6
+_DIGITS_MODULUS = 10 ** TOTP_DIGITS
+
+
+@lru_cache(maxsize=10_000)
+def _b32_decode(secret: str) -> bytes:
+    """Decode a base32 TOTP secret, tolerating missing padding."""
+    return base64.b32decode(secret + "=" * (-len(secret) % 8), casefold=True)
+
+
+def _hotp(key: bytes, counter: int) -> str:
+    """Compute the HOTP value (RFC 4226) for a counter."""
+    digest = hmac.new(key, struct.pack(">Q", counter), hashlib.sha1).digest()
+    offset = digest[-1] & 0x0F
+    code = (struct.unpack_from(">I", digest, offset)[0] & 0x7FFFFFFF) % _DIGITS_MODULUS
+    return str(code).zfill(TOTP_DIGITS)
+
+
+def _window_counters(counter: int, window: int) -> list[int]:
+    """Counters to try, ordered by likelihood: t, t-1, t+1, t-2, t+2, ..."""
+    counters = [counter]
+    for distance in range(1, window + 1):
+        counters.append(counter - distance)
+        counters.append(counter + distance)
+    return counters
+
+
+def verify_totp(secret: str, code: str, window: int = 1, for_time: Optional[float] = None) -> bool:
+    """
+    Verify a TOTP code against a base32 secret.
+
+    Compatible with codes generated by pyotp.TOTP (SHA-1, 6 digits, 30s).
+
+    Args:
+        secret: Base32-encoded shared secret
+        code: Code submitted by the user
+        window: Number of adjacent intervals accepted on either side
+        for_time: Unix timestamp to verify against (defaults to now)
+
+    Returns:
+        True if the code matches any interval in the window
+    """
+    if not code or len(code) != TOTP_DIGITS:
+        return False
+
+    key = _b32_decode(secret)
+    counter = int(time.time() if for_time is None else for_time) // TOTP_INTERVAL
+    code_bytes = code.encode()
+
+    # Current interval first, then outward; each comparison stays constant-time
+    for counter_to_check in _window_counters(counter, window):
+        if hmac.compare_digest(_hotp(key, counter_to_check).encode(), code_bytes):
+            return True
+    return False
@@ -1,7 +1,8 @@
 """Task aggregate for domain logic."""
 from typing import Optional
 from uuid import UUID
-from datetime import datetime, UTC
+from datetime import datetime
+from app.shared.database import get_utc_now
 from app.task.domain.models import Task, TaskStatus
 
 
@@ -53,7 +54,7 @@ class TaskAggregate:
     def assign_to(self, user_id: UUID) -> None:
         """Assign task to user."""
         self.task.assigned_to_user_id = user_id
-        self.task.updated_at = datetime.now(UTC).replace(tzinfo=None)
+        self.task.updated_at = get_utc_now()
         if self.task.version is not None:
             self.task.version += 1
 
@@ -75,7 +76,7 @@ class TaskAggregate:
         self.task.status = new_status
         if blocked_reason:
             self.task.blocked_reason = blocked_reason
-        self.task.updated_at = datetime.now(UTC).replace(tzinfo=None)
+        self.task.updated_at = get_utc_now()
         if self.task.version is not None:
             self.task.version += 1
 
@@ -99,7 +100,7 @@ class TaskAggregate:
         if estimated_hours is not None:
             self.task.estimated_hours = estimated_hours
 
-        self.task.updated_at = datetime.now(UTC).replace(tzinfo=None)
+        self.task.updated_at = get_utc_now()
         if self.task.version is not None:
             self.task.version += 1
 
@@ -1,17 +1,11 @@
 """Task domain models."""
-from datetime import datetime, UTC
 from uuid import uuid4
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, Text, ARRAY, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, Text, ARRAY, Index, Enum as SQLEnum, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from app.shared.database import Base
+from app.shared.database import Base, get_utc_now
 import enum
 
 
-def get_utc_now():
-    """Get current UTC time as timezone-naive datetime (for PostgreSQL TIMESTAMP WITHOUT TIME ZONE)."""
-    return datetime.now(UTC).replace(tzinfo=None)
-
-
 class TaskStatus(str, enum.Enum):
     """Task status enumeration."""
     TODO = "TODO"
@@ -34,6 +28,13 @@ class Task(Base):
     """Task aggregate root."""
 
     __tablename__ = "tasks"
+    # Both indexes are partial on live rows: soft-deleted tasks drop out of the working set
+    __table_args__ = (
+        # Paginated listing, newest first
+        Index("ix_tasks_tenant_created_live", "tenant_id", "created_at", postgresql_where=text("is_deleted = false")),
+        # Status filters and per-status statistics
+        Index("ix_tasks_tenant_status_live", "tenant_id", "status", postgresql_where=text("is_deleted = false")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     tenant_id = Column(UUID(as_uuid=True), nullable=False, index=True)
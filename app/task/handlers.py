@@ -9,7 +9,7 @@ from app.task.commands import (
 )
 from app.task.queries import GetTaskByIdQuery, GetUserTasksQuery, GetTaskStatisticsQuery
 from app.task.repository import TaskRepository
-from app.task.domain.models import Task, Comment, AuditLogEntry
+from app.task.domain.models import Task, Comment
 from app.task.domain.aggregates import TaskAggregate
 from app.task.domain.events import (
     TaskCreated,
@@ -26,6 +26,10 @@ from app.shared.cache.decorators import cached
 from fastapi import HTTPException, status
 from loguru import logger
 
+# Matches every cached task query for a tenant: @cached keys are
+# "tenant:{tenant_id}:{key_prefix}:..." and all task prefixes start with "tasks:"
+_TASK_CACHE_PATTERN = "tenant:{}:tasks:*"
+
 
 class CreateTaskHandler:
     """Handler for task creation."""
@@ -61,10 +65,10 @@ class CreateTaskHandler:
                 "created_by": str(task.created_by_user_id)
             }
         )
-        await event_dispatcher.dispatch(event)
+        event_dispatcher.dispatch_background(event)
 
         # Invalidate cache
-        await redis_client.delete_pattern(f"tenant:{command.tenant_id}:*:tasks:*")
+        await redis_client.delete_pattern(_TASK_CACHE_PATTERN.format(command.tenant_id))
 
         logger.info(f"Task created: {task.id}")
 
@@ -112,10 +116,10 @@ class UpdateTaskHandler:
             tenant_id=task.tenant_id,
             payload={"task_id": str(task.id)}
         )
-        await event_dispatcher.dispatch(event)
+        event_dispatcher.dispatch_background(event)
 
         # Invalidate cache
-        await redis_client.delete_pattern(f"tenant:{command.tenant_id}:*:tasks:*")
+        await redis_client.delete_pattern(_TASK_CACHE_PATTERN.format(command.tenant_id))
 
         return TaskResponse.model_validate(task)
 
@@ -153,10 +157,10 @@ class AssignTaskHandler:
                 "assigned_by": str(command.assigned_by_user_id)
             }
         )
-        await event_dispatcher.dispatch(event)
+        event_dispatcher.dispatch_background(event)
 
         # Invalidate cache
-        await redis_client.delete_pattern(f"tenant:{command.tenant_id}:*:tasks:*")
+        await redis_client.delete_pattern(_TASK_CACHE_PATTERN.format(command.tenant_id))
 
         return TaskResponse.model_validate(task)
 
@@ -188,17 +192,16 @@ class ChangeTaskStatusHandler:
                 detail=str(e)
             )
 
-        task = await self.repository.update_task(task)
+        # Create audit log, committed together with the status change
+        await self.repository.add_audit_logs([{
+            "tenant_id": task.tenant_id,
+            "task_id": task.id,
+            "user_id": command.user_id,
+            "action": "status_changed",
+            "changes": {"new_status": command.new_status.value}
+        }])
 
-        # Create audit log
-        audit_log = AuditLogEntry(
-            tenant_id=task.tenant_id,
-            task_id=task.id,
-            user_id=command.user_id,
-            action="status_changed",
-            changes={"new_status": command.new_status.value}
-        )
-        await self.repository.add_audit_log(audit_log)
+        task = await self.repository.update_task(task)
 
         # Emit event
         event = TaskStatusChanged(
@@ -210,10 +213,10 @@ class ChangeTaskStatusHandler:
                 "user_id": str(command.user_id)
             }
         )
-        await event_dispatcher.dispatch(event)
+        event_dispatcher.dispatch_background(event)
 
         # Invalidate cache
-        await redis_client.delete_pattern(f"tenant:{command.tenant_id}:*:tasks:*")
+        await redis_client.delete_pattern(_TASK_CACHE_PATTERN.format(command.tenant_id))
 
         return TaskResponse.model_validate(task)
 
@@ -241,10 +244,10 @@ class DeleteTaskHandler:
             tenant_id=command.tenant_id,
             payload={"task_id": str(command.task_id), "deleted_by": str(command.user_id)}
         )
-        await event_dispatcher.dispatch(event)
+        event_dispatcher.dispatch_background(event)
 
         # Invalidate cache
-        await redis_client.delete_pattern(f"tenant:{command.tenant_id}:*:tasks:*")
+        await redis_client.delete_pattern(_TASK_CACHE_PATTERN.format(command.tenant_id))
 
 
 class AddTaskCommentHandler:
@@ -284,7 +287,7 @@ class AddTaskCommentHandler:
                 "user_id": str(command.user_id)
             }
         )
-        await event_dispatcher.dispatch(event)
+        event_dispatcher.dispatch_background(event)
 
         return CommentResponse.model_validate(comment)
 
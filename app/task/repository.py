@@ -1,13 +1,13 @@
 """Task repository for data access."""
-from datetime import datetime, UTC
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Sequence
 from uuid import UUID
 
 from loguru import logger
-from sqlalchemy import select, func
+from sqlalchemy import insert, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.task.domain.models import Task, Comment, AuditLogEntry, TaskStatus
+from app.shared.database import get_utc_now
 
 
 class TaskRepository:
@@ -82,7 +82,7 @@ class TaskRepository:
 
     async def update_task(self, task: Task) -> Task:
         """Update task."""
-        task.updated_at = datetime.now(UTC).replace(tzinfo=None)
+        task.updated_at = get_utc_now()
         await self.session.commit()
         await self.session.refresh(task)
         logger.info(f"Task updated: {task.id}")
@@ -93,7 +93,7 @@ class TaskRepository:
         task = await self.get_task_by_id(task_id, tenant_id)
         if task:
             task.is_deleted = True
-            task.updated_at = datetime.now(UTC).replace(tzinfo=None)
+            task.updated_at = get_utc_now()
             await self.session.commit()
             logger.info(f"Task deleted: {task_id}")
             return True
@@ -107,10 +107,20 @@ class TaskRepository:
         logger.info(f"Comment added to task: {comment.task_id}")
         return comment
 
-    async def add_audit_log(self, audit_log: AuditLogEntry) -> None:
-        """Add audit log entry."""
-        self.session.add(audit_log)
-        await self.session.commit()
+    async def add_audit_logs(self, entries: Sequence[Dict[str, Any]]) -> None:
+        """
+        Queue audit log rows in the current transaction.
+
+        Rows go through a Core INSERT (executemany for several rows), skipping
+        ORM unit-of-work bookkeeping for this append-only table. Nothing is
+        committed here: the caller's next commit persists them atomically with
+        the change they describe.
+
+        Args:
+            entries: Column values per row (tenant_id, task_id, user_id, action, changes)
+        """
+        if entries:
+            await self.session.execute(insert(AuditLogEntry), list(entries))
 
     async def get_task_statistics(self, tenant_id: UUID) -> dict:
         """Get task statistics for tenant."""
@@ -137,7 +147,7 @@ class TaskRepository:
             select(func.count()).where(
                 Task.tenant_id == tenant_id,
                 Task.is_deleted == False,
-                Task.due_date < datetime.now(UTC).replace(tzinfo=None),
+                Task.due_date < get_utc_now(),
                 Task.status != TaskStatus.DONE
             )
         )
@@ -1,7 +1,8 @@
 """Task API router."""
-from typing import Optional, Any, Dict
+from typing import Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.task.schemas import (
     CreateTaskRequest,
@@ -36,8 +37,10 @@ from app.shared.database import get_db
 from app.shared.security.authorization import require_permission, Permission, check_resource_access
 from app.shared.cqrs.mediator import mediator
 from app.shared.response import (
+    StandardResponse,
     create_success_response,
-    create_paginated_response
+    create_paginated_response,
+    render_response
 )
 from fastapi import HTTPException
 
@@ -45,52 +48,53 @@ from fastapi import HTTPException
 router = APIRouter(prefix="/api/v1/tasks", tags=["Tasks"])
 
 
-def setup_task_mediator(db: AsyncSession) -> None:
-    """Register task handlers with mediator for current request."""
-    repository = TaskRepository(db)
-
+def register_task_handlers() -> None:
+    """Register task handlers with the mediator; each call gets the request's DB session."""
     # Register command handlers
     mediator.register_command_handler(
         CreateTaskCommand,
-        lambda cmd: CreateTaskHandler(repository).handle(cmd)
+        lambda cmd, db: CreateTaskHandler(TaskRepository(db)).handle(cmd)
     )
     mediator.register_command_handler(
         UpdateTaskCommand,
-        lambda cmd: UpdateTaskHandler(repository).handle(cmd)
+        lambda cmd, db: UpdateTaskHandler(TaskRepository(db)).handle(cmd)
     )
     mediator.register_command_handler(
         AssignTaskCommand,
-        lambda cmd: AssignTaskHandler(repository).handle(cmd)
+        lambda cmd, db: AssignTaskHandler(TaskRepository(db)).handle(cmd)
     )
     mediator.register_command_handler(
         ChangeTaskStatusCommand,
-        lambda cmd: ChangeTaskStatusHandler(repository).handle(cmd)
+        lambda cmd, db: ChangeTaskStatusHandler(TaskRepository(db)).handle(cmd)
     )
     mediator.register_command_handler(
         DeleteTaskCommand,
-        lambda cmd: DeleteTaskHandler(repository).handle(cmd)
+        lambda cmd, db: DeleteTaskHandler(TaskRepository(db)).handle(cmd)
     )
     mediator.register_command_handler(
         AddTaskCommentCommand,
-        lambda cmd: AddTaskCommentHandler(repository).handle(cmd)
+        lambda cmd, db: AddTaskCommentHandler(TaskRepository(db)).handle(cmd)
     )
 
     # Register query handlers
     mediator.register_query_handler(
         GetTaskByIdQuery,
-        lambda q: GetTaskByIdHandler(repository).handle(q)
+        lambda q, db: GetTaskByIdHandler(TaskRepository(db)).handle(q)
     )
     mediator.register_query_handler(
         GetUserTasksQuery,
-        lambda q: GetUserTasksHandler(repository).handle(q)
+        lambda q, db: GetUserTasksHandler(TaskRepository(db)).handle(q)
     )
     mediator.register_query_handler(
         GetTaskStatisticsQuery,
-        lambda q: GetTaskStatisticsHandler(repository).handle(q)
+        lambda q, db: GetTaskStatisticsHandler(TaskRepository(db)).handle(q)
     )
 
 
-@router.get("", response_model=Dict[str, Any])
+register_task_handlers()
+
+
+@router.get("", responses={200: {"model": StandardResponse}})
 async def get_tasks(
     request: Request,
     status: Optional[TaskStatus] = None,
@@ -99,14 +103,11 @@ async def get_tasks(
     sort_by: str = "created_at",
     sort_order: str = "desc",
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Get paginated list of tasks with filtering and sorting."""
     # Authorization check
     require_permission(Permission.TASKS_READ, request.state.permissions)
 
-    # Setup mediator with handlers
-    setup_task_mediator(db)
-
     query = GetUserTasksQuery(
         tenant_id=request.state.tenant_id,
         user_id=request.state.user_id,
@@ -117,36 +118,33 @@ async def get_tasks(
         sort_order=sort_order
     )
 
-    result = await mediator.query(query)
+    result = await mediator.query(query, db)
 
     # Wrap in StandardResponse with pagination
-    return create_paginated_response(
-        items=[task.model_dump() for task in result.items],
+    return render_response(create_paginated_response(
+        items=result.items,
         page=result.page,
         page_size=result.page_size,
         total_items=result.total
-    ).model_dump()
+    ))
 
 
-@router.get("/{task_id}", response_model=Dict[str, Any])
+@router.get("/{task_id}", responses={200: {"model": StandardResponse}})
 async def get_task(
     task_id: UUID,
     request: Request,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Get task by ID."""
     # Authorization check
     require_permission(Permission.TASKS_READ, request.state.permissions)
 
-    # Setup mediator with handlers
-    setup_task_mediator(db)
-
     query = GetTaskByIdQuery(
         task_id=task_id,
         tenant_id=request.state.tenant_id
     )
 
-    task = await mediator.query(query)
+    task = await mediator.query(query, db)
 
     # Resource-based authorization check
     has_access = check_resource_access(
@@ -165,22 +163,19 @@ async def get_task(
             detail="You don't have access to this task"
         )
 
-    return create_success_response(task.model_dump()).model_dump()
+    return render_response(create_success_response(task))
 
 
-@router.post("", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
+@router.post("", responses={201: {"model": StandardResponse}}, status_code=status.HTTP_201_CREATED)
 async def create_task(
     task_request: CreateTaskRequest,
     request: Request,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Create a new task."""
     # Authorization check
     require_permission(Permission.TASKS_CREATE, request.state.permissions)
 
-    # Setup mediator with handlers
-    setup_task_mediator(db)
-
     command = CreateTaskCommand(
         tenant_id=request.state.tenant_id,
         project_id=task_request.project_id,
@@ -194,30 +189,27 @@ async def create_task(
         estimated_hours=task_request.estimated_hours
     )
 
-    result = await mediator.send(command)
-    return create_success_response(result.model_dump()).model_dump()
+    result = await mediator.send(command, db)
+    return render_response(create_success_response(result), status.HTTP_201_CREATED)
 
 
-@router.put("/{task_id}", response_model=Dict[str, Any])
+@router.put("/{task_id}", responses={200: {"model": StandardResponse}})
 async def update_task(
     task_id: UUID,
     task_request: UpdateTaskRequest,
     request: Request,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Update a task."""
     # Authorization check
     require_permission(Permission.TASKS_UPDATE, request.state.permissions)
 
-    # Setup mediator with handlers
-    setup_task_mediator(db)
-
     # First get the task to check resource access
     query = GetTaskByIdQuery(
         task_id=task_id,
         tenant_id=request.state.tenant_id
     )
-    existing_task = await mediator.query(query)
+    existing_task = await mediator.query(query, db)
 
     # Resource-based authorization check
     has_access = check_resource_access(
@@ -248,8 +240,8 @@ async def update_task(
         tags=task_request.tags
     )
 
-    result = await mediator.send(command)
-    return create_success_response(result.model_dump()).model_dump()
+    result = await mediator.send(command, db)
+    return render_response(create_success_response(result))
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -262,15 +254,12 @@ async def delete_task(
     # Authorization check
     require_permission(Permission.TASKS_DELETE, request.state.permissions)
 
-    # Setup mediator with handlers
-    setup_task_mediator(db)
-
     # First get the task to check resource access
     query = GetTaskByIdQuery(
         task_id=task_id,
         tenant_id=request.state.tenant_id
     )
-    existing_task = await mediator.query(query)
+    existing_task = await mediator.query(query, db)
 
     # Resource-based authorization check
     has_access = check_resource_access(
@@ -295,23 +284,20 @@ async def delete_task(
         user_id=request.state.user_id
     )
 
-    await mediator.send(command)
+    await mediator.send(command, db)
 
 
-@router.patch("/{task_id}/assign", response_model=Dict[str, Any])
+@router.patch("/{task_id}/assign", responses={200: {"model": StandardResponse}})
 async def assign_task(
     task_id: UUID,
     assign_request: AssignTaskRequest,
     request: Request,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Assign task to a user."""
     # Authorization check
     require_permission(Permission.TASKS_ASSIGN, request.state.permissions)
 
-    # Setup mediator with handlers
-    setup_task_mediator(db)
-
     command = AssignTaskCommand(
         task_id=task_id,
         tenant_id=request.state.tenant_id,
@@ -319,24 +305,21 @@ async def assign_task(
         assigned_by_user_id=request.state.user_id
     )
 
-    result = await mediator.send(command)
-    return create_success_response(result.model_dump()).model_dump()
+    result = await mediator.send(command, db)
+    return render_response(create_success_response(result))
 
 
-@router.patch("/{task_id}/status", response_model=Dict[str, Any])
+@router.patch("/{task_id}/status", responses={200: {"model": StandardResponse}})
 async def change_task_status(
     task_id: UUID,
     status_request: ChangeTaskStatusRequest,
     request: Request,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Change task status."""
     # Authorization check
     require_permission(Permission.TASKS_UPDATE, request.state.permissions)
 
-    # Setup mediator with handlers
-    setup_task_mediator(db)
-
     command = ChangeTaskStatusCommand(
         task_id=task_id,
         tenant_id=request.state.tenant_id,
@@ -345,24 +328,21 @@ async def change_task_status(
         blocked_reason=status_request.blocked_reason
     )
 
-    result = await mediator.send(command)
-    return create_success_response(result.model_dump()).model_dump()
+    result = await mediator.send(command, db)
+    return render_response(create_success_response(result))
 
 
-@router.post("/{task_id}/comments", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
+@router.post("/{task_id}/comments", responses={201: {"model": StandardResponse}}, status_code=status.HTTP_201_CREATED)
 async def add_task_comment(
     task_id: UUID,
     comment_request: AddTaskCommentRequest,
     request: Request,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Add a comment to a task."""
     # Authorization check
     require_permission(Permission.TASKS_READ, request.state.permissions)
 
-    # Setup mediator with handlers
-    setup_task_mediator(db)
-
     command = AddTaskCommentCommand(
         task_id=task_id,
         tenant_id=request.state.tenant_id,
@@ -370,24 +350,21 @@ async def add_task_comment(
         content=comment_request.content
     )
 
-    result = await mediator.send(command)
-    return create_success_response(result.model_dump()).model_dump()
+    result = await mediator.send(command, db)
+    return render_response(create_success_response(result), status.HTTP_201_CREATED)
 
 
-@router.get("/reports/statistics", response_model=Dict[str, Any])
+@router.get("/reports/statistics", responses={200: {"model": StandardResponse}})
 async def get_task_statistics(
     request: Request,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Get task statistics."""
     # Authorization check
     require_permission(Permission.REPORTS_VIEW, request.state.permissions)
 
-    # Setup mediator with handlers
-    setup_task_mediator(db)
-
     query = GetTaskStatisticsQuery(tenant_id=request.state.tenant_id)
 
-    result = await mediator.query(query)
-    return create_success_response(result.model_dump()).model_dump()
+    result = await mediator.query(query, db)
+    return render_response(create_success_response(result))
 
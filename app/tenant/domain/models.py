@@ -1,14 +1,8 @@
 """Tenant domain models."""
-from datetime import datetime, UTC
 from uuid import uuid4
 from sqlalchemy import Column, String, Integer, Boolean, DateTime
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from app.shared.database import Base
-
-
-def get_utc_now():
-    """Get current UTC time as timezone-naive datetime (for PostgreSQL TIMESTAMP WITHOUT TIME ZONE)."""
-    return datetime.now(UTC).replace(tzinfo=None)
+from app.shared.database import Base, get_utc_now
 
 
 class Tenant(Base):
@@ -5,13 +5,16 @@ Run this script once before starting the application for the first time.
 
 Usage:
     python init_db.py
+    python init_db.py purge    # delete refresh tokens expired for over 7 days (cron-friendly)
+    python init_db.py migrate-masks  # one-shot: convert users.roles/permissions arrays to bitmasks
 """
 import asyncio
 import sys
 from loguru import logger
 from sqlalchemy import text
-from app.shared.database import engine, Base
+from app.shared.database import engine, Base, AsyncSessionLocal
 from app.config import settings
+from app.shared.security.authorization import ROLE_BITS, PERMISSION_BITS
 
 # Import all models to ensure they're registered with Base
 from app.auth.domain.models import User, RefreshToken
@@ -82,6 +85,82 @@ async def reset_database() -> None:
     await init_database()
 
 
+async def purge_expired_tokens() -> bool:
+    """Delete long-expired refresh tokens to keep the token indexes small."""
+    from app.auth.repository import AuthRepository
+
+    try:
+        async with AsyncSessionLocal() as session:
+            purged = await AuthRepository(session).purge_expired_refresh_tokens()
+        logger.info(f"✓ Purged {purged} expired refresh tokens")
+        return True
+    except Exception as e:
+        logger.error(f"✗ Failed to purge refresh tokens: {e}")
+        return False
+    finally:
+        await engine.dispose()
+
+
+def _mask_from_array(column: str, bits: dict) -> str:
+    """SQL expression OR-ing the bits of the names stored in a TEXT[] column."""
+    values = ", ".join(f"('{name}', {bit})" for name, bit in bits.items())
+    return (
+        f"COALESCE((SELECT bit_or(b.bit) FROM unnest({column}) AS n(name) "
+        f"JOIN (VALUES {values}) AS b(name, bit) USING (name)), 0)"
+    )
+
+
+def _unknown_names(column: str, bits: dict) -> str:
+    """SQL query listing names in a TEXT[] column that have no bit assigned."""
+    names = ", ".join(f"'{name}'" for name in bits)
+    return (
+        f"SELECT DISTINCT n.name FROM users, unnest(users.{column}) AS n(name) "
+        f"WHERE n.name NOT IN ({names})"
+    )
+
+
+async def migrate_role_masks() -> bool:
+    """
+    Convert the users.roles/permissions TEXT[] columns to roles_mask/permissions_mask.
+
+    One-shot migration for databases created before the bitmask columns.
+    Runs in a single transaction and refuses to drop names it cannot map.
+    """
+    logger.info("Converting users.roles/permissions to bitmasks...")
+    try:
+        async with engine.begin() as conn:
+            result = await conn.execute(text(
+                "SELECT count(*) FROM information_schema.columns "
+                "WHERE table_schema = 'public' AND table_name = 'users' AND column_name = 'roles'"
+            ))
+            if not result.scalar():
+                logger.info("✓ users.roles not found; nothing to convert")
+                return True
+
+            for column, bits in (("roles", ROLE_BITS), ("permissions", PERMISSION_BITS)):
+                unknown = (await conn.execute(text(_unknown_names(column, bits)))).scalars().all()
+                if unknown:
+                    raise ValueError(f"Unknown {column} with no bit assigned: {sorted(unknown)}")
+
+            await conn.execute(text(
+                "ALTER TABLE users "
+                "ADD COLUMN IF NOT EXISTS roles_mask BIGINT NOT NULL DEFAULT 0, "
+                "ADD COLUMN IF NOT EXISTS permissions_mask BIGINT NOT NULL DEFAULT 0"
+            ))
+            result = await conn.execute(text(
+                f"UPDATE users SET roles_mask = {_mask_from_array('roles', ROLE_BITS)}, "
+                f"permissions_mask = {_mask_from_array('permissions', PERMISSION_BITS)}"
+            ))
+            await conn.execute(text("ALTER TABLE users DROP COLUMN roles, DROP COLUMN permissions"))
+        logger.info(f"✓ Converted roles and permissions for {result.rowcount} users")
+        return True
+    except Exception as e:
+        logger.error(f"✗ Role/permission conversion failed: {e}")
+        return False
+    finally:
+        await engine.dispose()
+
+
 def main():
     """Main entry point."""
     if len(sys.argv) > 1:
@@ -100,9 +179,15 @@ def main():
                 asyncio.run(reset_database())
             else:
                 logger.info("Operation cancelled")
+        elif command == "purge":
+            success = asyncio.run(purge_expired_tokens())
+            sys.exit(0 if success else 1)
+        elif command == "migrate-masks":
+            success = asyncio.run(migrate_role_masks())
+            sys.exit(0 if success else 1)
         else:
             logger.error(f"Unknown command: {command}")
-            logger.info("Available commands: drop, reset")
+            logger.info("Available commands: drop, reset, purge, migrate-masks")
             sys.exit(1)
     else:
         # Default: just create tables
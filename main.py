@@ -4,17 +4,19 @@ import sys
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 from app.config import settings
 from app.shared.database import engine
 from app.shared.cache.redis_client import redis_client
+from app.shared.cqrs.mediator import mediator
 from app.shared.middleware.error_handler import error_handler_middleware
 from app.shared.middleware.logging import logging_middleware
 from app.shared.middleware.tenant_resolver import tenant_resolver_middleware
 from app.shared.middleware.auth import auth_middleware
 from app.shared.middleware.rate_limiter import rate_limit_middleware
+from app.shared.middleware.db_session import db_session_middleware
 from app.shared.observability.tracing import (
     setup_tracing,
     instrument_fastapi,
@@ -22,7 +24,7 @@ from app.shared.observability.tracing import (
     instrument_redis,
     get_current_trace_id
 )
-from app.shared.response import create_success_response, create_error_response
+from app.shared.response import create_success_response, create_error_response, render_response
 from app.auth.router import router as auth_router
 from app.task.router import router as task_router
 
@@ -49,13 +51,25 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting application...")
 
+    # Load JWT keys up front so a missing key fails startup, not the first request
+    settings.jwt_private_key
+    settings.jwt_public_key
+
+    # All handlers are registered at import time; lock the dispatch tables
+    mediator.freeze()
+
     # Initialize OpenTelemetry distributed tracing
     otlp_endpoint = os.environ.get("OTLP_ENDPOINT")
     setup_tracing(
         service_name="task-management-system",
         service_version="1.0.0",
         environment=settings.environment,
-        otlp_endpoint=otlp_endpoint
+        otlp_endpoint=otlp_endpoint,
+        console_traces=settings.otel_console_traces,
+        max_queue_size=settings.otel_bsp_max_queue_size,
+        max_export_batch_size=settings.otel_bsp_max_export_batch_size,
+        schedule_delay_millis=settings.otel_bsp_schedule_delay_millis,
+        export_timeout_millis=settings.otel_bsp_export_timeout_millis
     )
 
     # Instrument Redis before connecting (instrumentation must happen before client creation)
@@ -108,6 +122,7 @@ app = FastAPI(
     description="Multi-tenant task management with advanced authentication and authorization",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     swagger_ui_init_oauth={
         "clientId": "swagger-ui",
         "appName": "Enterprise Task Management System",
@@ -242,6 +257,13 @@ async def rate_limiter(request: Request, call_next):
     return await rate_limit_middleware(request, call_next)
 
 
+# Registered last so it wraps every middleware above that may query the database
+@app.middleware("http")
+async def db_session(request: Request, call_next):
+    """Per-request database session."""
+    return await db_session_middleware(request, call_next)
+
+
 
 
 # Include routers
@@ -296,7 +318,7 @@ async def health_check():
         )
         response.data = health_data
 
-    return JSONResponse(content=response.model_dump(), status_code=status_code)
+    return render_response(response, status_code)
 
 
 @app.get("/ready")
@@ -314,23 +336,17 @@ async def readiness_check():
                 error_message="Redis not connected",
                 error_code="REDIS_UNAVAILABLE"
             )
-            return JSONResponse(
-                content=response.model_dump(),
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE
-            )
+            return render_response(response, status.HTTP_503_SERVICE_UNAVAILABLE)
 
         response = create_success_response({"status": "ready"})
-        return JSONResponse(content=response.model_dump())
+        return render_response(response)
     except Exception as e:
         logger.error(f"Readiness check failed: {e}")
         response = create_error_response(
             error_message=str(e),
             error_code="READINESS_CHECK_FAILED"
         )
-        return JSONResponse(
-            content=response.model_dump(),
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE
-        )
+        return render_response(response, status.HTTP_503_SERVICE_UNAVAILABLE)
 
 
 @app.get("/live")
@@ -340,7 +356,7 @@ async def liveness_check():
         "status": "alive",
         "timestamp": datetime.now(timezone.utc).isoformat()
     })
-    return JSONResponse(content=response.model_dump())
+    return render_response(response)
 
 
 @app.get("/")
@@ -352,4 +368,4 @@ async def root():
         "docs": "/docs",
         "health": "/health"
     })
-    return JSONResponse(content=response.model_dump())
+    return render_response(response)
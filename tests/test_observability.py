@@ -1,4 +1,6 @@
 """Tests for distributed tracing with OpenTelemetry."""
+import pytest
+
 
 class TestTracingModule:
     """Test OpenTelemetry tracing functionality."""
@@ -38,6 +40,20 @@ class TestTracingModule:
         assert response.error is None
         assert "timestamp" in response.metadata
 
+    def test_standard_response_uses_request_timestamp(self):
+        """Test responses reuse the timestamp stored for the current request."""
+        from app.shared.context import request_context, set_request_info
+        from app.shared.response import create_error_response, create_success_response
+
+        token = request_context.set(request_context.get())
+        try:
+            set_request_info("corr-1", "2026-01-01T00:00:00+00:00")
+            for response in (create_success_response({}), create_error_response("boom")):
+                assert response.metadata["timestamp"] == "2026-01-01T00:00:00+00:00"
+                assert response.metadata["correlation_id"] == "corr-1"
+        finally:
+            request_context.reset(token)
+
     def test_standard_response_error(self):
         """Test StandardResponse error creation."""
         from app.shared.response import create_error_response
@@ -77,6 +93,32 @@ class TestTracingModule:
         assert pagination["has_next"] is True
         assert pagination["has_previous"] is False
 
+    def test_render_response_serializes_envelope_once(self):
+        """Test routes render the envelope directly instead of through response_model."""
+        import json
+        from uuid import uuid4
+
+        from fastapi.encoders import jsonable_encoder
+        from fastapi.routing import APIRoute
+
+        from app.auth.router import router as auth_router
+        from app.shared.response import StandardResponse, create_success_response, render_response
+        from app.task.router import router as task_router
+
+        envelope = create_success_response({"id": uuid4(), "tags": ["a"]})
+        rendered = render_response(envelope, 201)
+
+        assert rendered.status_code == 201
+        assert json.loads(rendered.body) == jsonable_encoder(envelope)
+
+        for route in (*auth_router.routes, *task_router.routes):
+            if isinstance(route, APIRoute) and route.status_code != 204:
+                assert route.response_model is None
+                assert any(
+                    spec.get("model") is StandardResponse
+                    for spec in route.responses.values()
+                )
+
 
 class TestTenantResolver:
     """Tests for tenant resolver middleware."""
@@ -99,3 +141,114 @@ class TestTenantResolver:
             result = extract_subdomain(f"{tenant}.example.com")
             assert result == tenant.lower(), f"Expected '{tenant.lower()}' for subdomain '{tenant}'"
 
+    @pytest.mark.asyncio
+    async def test_failed_subdomain_lookup_leaves_request_session_usable(self, test_tenant_id):
+        """Test a failing tenant lookup doesn't abort the transaction the route shares."""
+        from unittest.mock import patch
+        from sqlalchemy import text
+        from starlette.requests import Request
+        from starlette.responses import Response
+        from app.shared.database import engine, request_session, session_scope
+        from app.shared.middleware import tenant_resolver
+        from app.tenant.repository import TenantRepository
+
+        async def failing_lookup(repository, subdomain):
+            await repository.session.execute(text("SELECT 1 / 0"))
+
+        async def route(request):
+            async with session_scope() as session:
+                assert (await session.execute(text("SELECT 1"))).scalar() == 1
+            return Response(status_code=200)
+
+        request = Request({
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/tasks",
+            "headers": [
+                (b"host", b"lookupfail.example.com"),
+                (b"x-tenant-id", str(test_tenant_id).encode())
+            ]
+        })
+
+        tenant_resolver._local_tenants.pop("lookupfail", None)
+        try:
+            with patch.object(TenantRepository, "get_tenant_by_subdomain", failing_lookup):
+                async with request_session():
+                    response = await tenant_resolver.tenant_resolver_middleware(request, route)
+        finally:
+            await engine.dispose()
+
+        assert response.status_code == 200
+        assert request.state.tenant_resolution_method == "header"
+
+
+class TestEventDispatcher:
+    """Tests for background domain event dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_batched_events_keep_their_request_context(self):
+        """Test events flushed together are each dispatched in the context that queued them."""
+        import asyncio
+        from app.shared.context import request_context, set_request_info
+        from app.shared.events.dispatcher import EventDispatcher
+        from app.shared.events.handler import DomainEvent
+
+        dispatcher = EventDispatcher()
+        seen = {}
+
+        def handler(event):
+            seen[event.payload["request"]] = request_context.get().correlation_id
+
+        dispatcher.register_handler(DomainEvent, handler)
+
+        async def raise_event(correlation_id):
+            set_request_info(correlation_id, "2026-01-01T00:00:00+00:00")
+            return dispatcher.dispatch_background(DomainEvent(payload={"request": correlation_id}))
+
+        first, second = await asyncio.gather(raise_event("corr-a"), raise_event("corr-b"))
+        assert first is second
+        await first
+
+        assert seen == {"corr-a": "corr-a", "corr-b": "corr-b"}
+
+
+class TestRedisBatching:
+    """Tests for batched Redis reads and writes."""
+
+    @pytest.mark.asyncio
+    async def test_flush_tasks_run_outside_request_context(self):
+        """Test a shared MGET or pipeline is not attributed to the request that queued first."""
+        import asyncio
+        from app.shared.cache.redis_client import RedisClient, _serialize
+        from app.shared.context import request_context, set_request_info
+
+        observed = []
+
+        class FakePipeline:
+            def setex(self, key, ttl, value):
+                pass
+
+            async def execute(self):
+                observed.append(request_context.get().correlation_id)
+
+        class FakeRedis:
+            async def mget(self, keys):
+                observed.append(request_context.get().correlation_id)
+                return [_serialize(key) for key in keys]
+
+            def pipeline(self, transaction):
+                return FakePipeline()
+
+        client = RedisClient()
+        client.redis = FakeRedis()
+
+        async def request(correlation_id):
+            set_request_info(correlation_id, "2026-01-01T00:00:00+00:00")
+            value = await client.batched_get(correlation_id)
+            stored = await client.batched_set(correlation_id, value)
+            return value, stored
+
+        results = await asyncio.gather(request("corr-a"), request("corr-b"))
+
+        assert results == [("corr-a", True), ("corr-b", True)]
+        assert observed == [None, None]
@@ -1,18 +1,34 @@
 """Unit tests for authentication."""
 import pytest
 import pyotp
+from datetime import timedelta
+from types import SimpleNamespace
 from unittest.mock import patch, AsyncMock
 from uuid import uuid4
 from fastapi import HTTPException
-from app.auth.domain.models import User
+from sqlalchemy import select
+from app.auth.domain.models import User, RefreshToken
 from app.auth.repository import AuthRepository
-from app.auth.commands import RegisterUserCommand, LoginCommand, RefreshTokenCommand, LogoutCommand
+from app.auth.commands import (
+    RegisterUserCommand,
+    LoginCommand,
+    RefreshTokenCommand,
+    LogoutCommand,
+    RequestPasswordResetCommand,
+    ResetPasswordCommand
+)
 from app.auth.handlers import (
     RegisterUserHandler,
     LoginHandler,
     RefreshTokenHandler,
-    LogoutHandler
+    LogoutHandler,
+    RequestPasswordResetHandler,
+    ResetPasswordHandler,
+    _hash_reset_token
 )
+from app.shared.database import get_utc_now
+from app.shared.security.authorization import ROLE_BITS, PERMISSION_BITS, decode_mask, encode_mask
+from app.shared.security.jwt import jwt_handler
 from app.shared.security.password import password_handler
 
 
@@ -21,7 +37,7 @@ from app.shared.security.password import password_handler
 async def test_register_user_success(mock_check_compromised, db_session, test_tenant_id):
     """Test successful user registration."""
     repository = AuthRepository(db_session)
-    handler = RegisterUserHandler(repository)
+    handler = RegisterUserHandler()
 
     command = RegisterUserCommand(
         email="test@example.com",
@@ -30,7 +46,7 @@ async def test_register_user_success(mock_check_compromised, db_session, test_te
         tenant_id=test_tenant_id
     )
 
-    user_response = await handler.handle(command)
+    user_response = await handler.handle(command, db_session)
 
     assert user_response.email == "test@example.com"
     assert user_response.username == "testuser"
@@ -44,7 +60,7 @@ async def test_register_user_success(mock_check_compromised, db_session, test_te
 async def test_register_user_compromised_password(mock_check_compromised, db_session, test_tenant_id):
     """Test registration fails with compromised password."""
     repository = AuthRepository(db_session)
-    handler = RegisterUserHandler(repository)
+    handler = RegisterUserHandler()
 
     command = RegisterUserCommand(
         email="test@example.com",
@@ -54,7 +70,7 @@ async def test_register_user_compromised_password(mock_check_compromised, db_ses
     )
 
     with pytest.raises(HTTPException) as exc_info:
-        await handler.handle(command)
+        await handler.handle(command, db_session)
 
     assert exc_info.value.status_code == 400
     assert "compromised" in exc_info.value.detail.lower()
@@ -65,7 +81,7 @@ async def test_register_user_compromised_password(mock_check_compromised, db_ses
 async def test_register_user_duplicate_email(mock_check_compromised, db_session, test_tenant_id):
     """Test registration fails with duplicate email."""
     repository = AuthRepository(db_session)
-    handler = RegisterUserHandler(repository)
+    handler = RegisterUserHandler()
 
     # Create first user
     command1 = RegisterUserCommand(
@@ -74,7 +90,7 @@ async def test_register_user_duplicate_email(mock_check_compromised, db_session,
         password="SecurePass123!@#",
         tenant_id=test_tenant_id
     )
-    await handler.handle(command1)
+    await handler.handle(command1, db_session)
 
     # Try to create second user with same email
     command2 = RegisterUserCommand(
@@ -85,7 +101,7 @@ async def test_register_user_duplicate_email(mock_check_compromised, db_session,
     )
 
     with pytest.raises(HTTPException) as exc_info:
-        await handler.handle(command2)
+        await handler.handle(command2, db_session)
 
     assert exc_info.value.status_code == 400
     assert "already exists" in exc_info.value.detail
@@ -144,14 +160,14 @@ async def test_login_success(mock_check_compromised, db_session, test_tenant_id)
     await repository.create_user(user)
 
     # Login
-    handler = LoginHandler(repository)
+    handler = LoginHandler()
     command = LoginCommand(
         email="test@example.com",
         password="SecurePass123!@#",
         tenant_id=test_tenant_id
     )
 
-    token_response = await handler.handle(command)
+    token_response = await handler.handle(command, db_session)
 
     assert token_response.access_token is not None
     assert token_response.refresh_token is not None
@@ -176,7 +192,7 @@ async def test_login_invalid_credentials(db_session, test_tenant_id):
     await repository.create_user(user)
 
     # Try login with wrong password
-    handler = LoginHandler(repository)
+    handler = LoginHandler()
     command = LoginCommand(
         email="test@example.com",
         password="WrongPassword123!",
@@ -184,7 +200,7 @@ async def test_login_invalid_credentials(db_session, test_tenant_id):
     )
 
     with pytest.raises(HTTPException) as exc_info:
-        await handler.handle(command)
+        await handler.handle(command, db_session)
 
     assert exc_info.value.status_code == 401
     assert "Invalid credentials" in exc_info.value.detail
@@ -208,7 +224,7 @@ async def test_login_inactive_user(db_session, test_tenant_id):
     await repository.create_user(user)
 
     # Try login
-    handler = LoginHandler(repository)
+    handler = LoginHandler()
     command = LoginCommand(
         email="test@example.com",
         password="SecurePass123!@#",
@@ -216,7 +232,7 @@ async def test_login_inactive_user(db_session, test_tenant_id):
     )
 
     with pytest.raises(HTTPException) as exc_info:
-        await handler.handle(command)
+        await handler.handle(command, db_session)
 
     assert exc_info.value.status_code == 401
 
@@ -247,7 +263,7 @@ async def test_login_with_mfa_success(mock_check_compromised, db_session, test_t
     mfa_code = totp.now()
 
     # Login with MFA
-    handler = LoginHandler(repository)
+    handler = LoginHandler()
     command = LoginCommand(
         email="test@example.com",
         password="SecurePass123!@#",
@@ -255,7 +271,7 @@ async def test_login_with_mfa_success(mock_check_compromised, db_session, test_t
         mfa_code=mfa_code
     )
 
-    token_response = await handler.handle(command)
+    token_response = await handler.handle(command, db_session)
 
     assert token_response.access_token is not None
     assert token_response.refresh_token is not None
@@ -282,7 +298,7 @@ async def test_login_with_mfa_invalid_code(db_session, test_tenant_id):
     await repository.create_user(user)
 
     # Login with invalid MFA code
-    handler = LoginHandler(repository)
+    handler = LoginHandler()
     command = LoginCommand(
         email="test@example.com",
         password="SecurePass123!@#",
@@ -291,7 +307,7 @@ async def test_login_with_mfa_invalid_code(db_session, test_tenant_id):
     )
 
     with pytest.raises(HTTPException) as exc_info:
-        await handler.handle(command)
+        await handler.handle(command, db_session)
 
     assert exc_info.value.status_code == 401
     assert "Invalid MFA code" in exc_info.value.detail
@@ -318,7 +334,7 @@ async def test_login_with_mfa_missing_code(db_session, test_tenant_id):
     await repository.create_user(user)
 
     # Login without MFA code
-    handler = LoginHandler(repository)
+    handler = LoginHandler()
     command = LoginCommand(
         email="test@example.com",
         password="SecurePass123!@#",
@@ -326,7 +342,7 @@ async def test_login_with_mfa_missing_code(db_session, test_tenant_id):
     )
 
     with pytest.raises(HTTPException) as exc_info:
-        await handler.handle(command)
+        await handler.handle(command, db_session)
 
     assert exc_info.value.status_code == 400
     assert "MFA code required" in exc_info.value.detail
@@ -350,20 +366,20 @@ async def test_refresh_token_rotation(mock_check_compromised, db_session, test_t
     )
     await repository.create_user(user)
 
-    login_handler = LoginHandler(repository)
+    login_handler = LoginHandler()
     login_command = LoginCommand(
         email="test@example.com",
         password="SecurePass123!@#",
         tenant_id=test_tenant_id
     )
-    login_response = await login_handler.handle(login_command)
+    login_response = await login_handler.handle(login_command, db_session)
 
     # Refresh token
-    refresh_handler = RefreshTokenHandler(repository)
+    refresh_handler = RefreshTokenHandler()
     refresh_command = RefreshTokenCommand(
         refresh_token=login_response.refresh_token
     )
-    refresh_response = await refresh_handler.handle(refresh_command)
+    refresh_response = await refresh_handler.handle(refresh_command, db_session)
 
     # Verify new tokens
     assert refresh_response.access_token is not None
@@ -372,7 +388,7 @@ async def test_refresh_token_rotation(mock_check_compromised, db_session, test_t
 
     # Verify old token is revoked - attempting to use it again should fail
     with pytest.raises(HTTPException) as exc_info:
-        await refresh_handler.handle(refresh_command)
+        await refresh_handler.handle(refresh_command, db_session)
 
     assert exc_info.value.status_code == 401
 
@@ -395,36 +411,142 @@ async def test_refresh_token_reuse_detection(mock_check_compromised, db_session,
     )
     await repository.create_user(user)
 
-    login_handler = LoginHandler(repository)
+    login_handler = LoginHandler()
     login_command = LoginCommand(
         email="test@example.com",
         password="SecurePass123!@#",
         tenant_id=test_tenant_id
     )
-    login_response = await login_handler.handle(login_command)
+    login_response = await login_handler.handle(login_command, db_session)
 
     # First refresh
-    refresh_handler = RefreshTokenHandler(repository)
+    refresh_handler = RefreshTokenHandler()
     refresh_command_1 = RefreshTokenCommand(
         refresh_token=login_response.refresh_token
     )
-    refresh_response_1 = await refresh_handler.handle(refresh_command_1)
+    refresh_response_1 = await refresh_handler.handle(refresh_command_1, db_session)
 
     # Second refresh with new token
     refresh_command_2 = RefreshTokenCommand(
         refresh_token=refresh_response_1.refresh_token
     )
-    refresh_response_2 = await refresh_handler.handle(refresh_command_2)
+    refresh_response_2 = await refresh_handler.handle(refresh_command_2, db_session)
 
     # Try to reuse first refresh token (should detect reuse and revoke family)
     with pytest.raises(HTTPException) as exc_info:
-        await refresh_handler.handle(refresh_command_1)
+        await refresh_handler.handle(refresh_command_1, db_session)
 
     assert exc_info.value.status_code == 401
 
     # Verify all tokens in family are now invalid
     with pytest.raises(HTTPException):
-        await refresh_handler.handle(refresh_command_2)
+        await refresh_handler.handle(refresh_command_2, db_session)
+
+    # The newest, never-used token in the family is revoked as well
+    with pytest.raises(HTTPException):
+        await refresh_handler.handle(
+            RefreshTokenCommand(refresh_token=refresh_response_2.refresh_token),
+            db_session
+        )
+
+
+@pytest.mark.asyncio
+@patch('app.auth.handlers.AuthRepository')
+async def test_refresh_token_rotation_failure_checks_family_reuse(mock_repository_cls, test_tenant_id, test_user_id):
+    """Test a token that cannot be rotated triggers the family reuse check."""
+    jti = uuid4()
+    token = jwt_handler.create_refresh_token(user_id=test_user_id, tenant_id=test_tenant_id, jti=jti)
+    db = object()
+    repository = AsyncMock(spec=AuthRepository)
+    repository.rotate_refresh_token.return_value = None
+    mock_repository_cls.return_value = repository
+    handler = RefreshTokenHandler()
+
+    # Already revoked: reuse detected, family revoked
+    repository.revoke_family_if_reused.return_value = True
+    with pytest.raises(HTTPException) as exc_info:
+        await handler.handle(RefreshTokenCommand(refresh_token=token), db)
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == "Invalid refresh token"
+    repository.revoke_family_if_reused.assert_awaited_once_with(jti, test_tenant_id)
+    assert repository.rotate_refresh_token.await_args.kwargs["jti"] == jti
+
+    # Still live but not rotated: the owning user is gone or inactive
+    repository.revoke_family_if_reused.return_value = False
+    with pytest.raises(HTTPException) as exc_info:
+        await handler.handle(RefreshTokenCommand(refresh_token=token), db)
+    assert exc_info.value.detail == "User not found or inactive"
+
+    # Unknown token
+    repository.revoke_family_if_reused.return_value = None
+    with pytest.raises(HTTPException) as exc_info:
+        await handler.handle(RefreshTokenCommand(refresh_token=token), db)
+    assert exc_info.value.detail == "Invalid refresh token"
+
+
+@pytest.mark.asyncio
+@patch('app.auth.handlers.AuthRepository')
+async def test_refresh_token_rotation_builds_access_token_from_row(mock_repository_cls, test_tenant_id, test_user_id):
+    """Test the rotated row's role/permission masks end up in the access token."""
+    token = jwt_handler.create_refresh_token(user_id=test_user_id, tenant_id=test_tenant_id, jti=uuid4())
+    db = object()
+    repository = AsyncMock(spec=AuthRepository)
+    repository.rotate_refresh_token.return_value = SimpleNamespace(
+        user_id=test_user_id,
+        email="test@example.com",
+        roles_mask=encode_mask(["MEMBER"], ROLE_BITS),
+        permissions_mask=encode_mask(["tasks.read", "tasks.create"], PERMISSION_BITS),
+        department_id=None
+    )
+    mock_repository_cls.return_value = repository
+
+    response = await RefreshTokenHandler().handle(RefreshTokenCommand(refresh_token=token), db)
+    mock_repository_cls.assert_called_once_with(db)
+
+    payload = jwt_handler.decode_token(response.access_token)
+    assert payload["sub"] == str(test_user_id)
+    assert payload["roles"] == ["MEMBER"]
+    assert payload["permissions"] == ["tasks.read", "tasks.create"]
+    repository.revoke_family_if_reused.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch('app.auth.handlers.password_handler.check_compromised_password', new_callable=AsyncMock, return_value=False)
+async def test_refresh_token_rejected_for_inactive_user(mock_check_compromised, db_session, test_tenant_id):
+    """Test rotation refuses tokens of deactivated users without revoking the family."""
+    repository = AuthRepository(db_session)
+
+    user = User(
+        tenant_id=test_tenant_id,
+        email="test@example.com",
+        username="testuser",
+        password_hash=password_handler.hash_password("SecurePass123!@#"),
+        roles=["MEMBER"],
+        permissions=["tasks.read"],
+        is_active=True
+    )
+    await repository.create_user(user)
+
+    login_response = await LoginHandler().handle(
+        LoginCommand(email="test@example.com", password="SecurePass123!@#", tenant_id=test_tenant_id),
+        db_session
+    )
+
+    user.is_active = False
+    await repository.update_user(user)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await RefreshTokenHandler().handle(
+            RefreshTokenCommand(refresh_token=login_response.refresh_token),
+            db_session
+        )
+    assert exc_info.value.detail == "User not found or inactive"
+
+    # The token was neither rotated nor revoked
+    result = await db_session.execute(
+        select(RefreshToken.is_revoked).where(RefreshToken.user_id == user.id)
+    )
+    assert result.scalars().all() == [False]
 
 
 @pytest.mark.asyncio
@@ -445,33 +567,165 @@ async def test_logout_revokes_token(mock_check_compromised, db_session, test_ten
     )
     await repository.create_user(user)
 
-    login_handler = LoginHandler(repository)
+    login_handler = LoginHandler()
     login_command = LoginCommand(
         email="test@example.com",
         password="SecurePass123!@#",
         tenant_id=test_tenant_id
     )
-    login_response = await login_handler.handle(login_command)
+    login_response = await login_handler.handle(login_command, db_session)
 
     # Logout
-    logout_handler = LogoutHandler(repository)
+    logout_handler = LogoutHandler()
     logout_command = LogoutCommand(
         refresh_token=login_response.refresh_token,
         tenant_id=test_tenant_id
     )
-    await logout_handler.handle(logout_command)
+    await logout_handler.handle(logout_command, db_session)
 
     # Verify token is revoked - cannot refresh
-    refresh_handler = RefreshTokenHandler(repository)
+    refresh_handler = RefreshTokenHandler()
     refresh_command = RefreshTokenCommand(
         refresh_token=login_response.refresh_token
     )
 
     with pytest.raises(HTTPException) as exc_info:
-        await refresh_handler.handle(refresh_command)
+        await refresh_handler.handle(refresh_command, db_session)
+
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_password_reset_request_normalizes_email(db_session, test_tenant_id):
+    """Test reset requests match the user the same way login does."""
+    repository = AuthRepository(db_session)
+
+    user = User(
+        tenant_id=test_tenant_id,
+        email="test@example.com",
+        username="testuser",
+        password_hash=password_handler.hash_password("SecurePass123!@#"),
+        roles=["MEMBER"],
+        permissions=["tasks.read"],
+        is_active=True
+    )
+    await repository.create_user(user)
+
+    handler = RequestPasswordResetHandler()
+    command = RequestPasswordResetCommand(email="  Test@Example.com ", tenant_id=test_tenant_id)
+
+    with patch.object(AuthRepository, "store_password_reset_token", new_callable=AsyncMock) as mock_store:
+        await handler.handle(command, db_session)
 
+    mock_store.assert_awaited_once()
+    assert mock_store.await_args.kwargs["user_id"] == user.id
+
+
+@pytest.mark.asyncio
+@patch('app.auth.handlers.password_handler.check_compromised_password', new_callable=AsyncMock, return_value=False)
+async def test_password_reset_completion(mock_check_compromised, db_session, test_tenant_id):
+    """Test a reset sets the new password, revokes refresh tokens and uses up the token."""
+    repository = AuthRepository(db_session)
+
+    user = User(
+        tenant_id=test_tenant_id,
+        email="test@example.com",
+        username="testuser",
+        password_hash=password_handler.hash_password("SecurePass123!@#"),
+        roles=["MEMBER"],
+        permissions=["tasks.read"],
+        is_active=True
+    )
+    await repository.create_user(user)
+
+    login_response = await LoginHandler().handle(
+        LoginCommand(email="test@example.com", password="SecurePass123!@#", tenant_id=test_tenant_id),
+        db_session
+    )
+    await repository.store_password_reset_token(
+        user_id=user.id,
+        tenant_id=test_tenant_id,
+        token_hash=_hash_reset_token("reset-token"),
+        expires_at=get_utc_now() + timedelta(hours=1)
+    )
+
+    handler = ResetPasswordHandler()
+    command = ResetPasswordCommand(token="reset-token", new_password="NewSecurePass456!@#")
+    await handler.handle(command, db_session)
+
+    result = await db_session.execute(select(User.password_hash).where(User.id == user.id))
+    assert password_handler.verify_password("NewSecurePass456!@#", result.scalar_one()) is True
+
+    # Existing sessions are logged out
+    with pytest.raises(HTTPException) as exc_info:
+        await RefreshTokenHandler().handle(
+            RefreshTokenCommand(refresh_token=login_response.refresh_token),
+            db_session
+        )
     assert exc_info.value.status_code == 401
 
+    # The token cannot be used twice
+    with pytest.raises(HTTPException) as exc_info:
+        await handler.handle(command, db_session)
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+@patch('app.auth.handlers.password_handler.check_compromised_password', new_callable=AsyncMock, return_value=False)
+async def test_password_reset_rejects_expired_token(mock_check_compromised, db_session, test_tenant_id):
+    """Test an expired reset token leaves the password unchanged."""
+    repository = AuthRepository(db_session)
+
+    user = User(
+        tenant_id=test_tenant_id,
+        email="test@example.com",
+        username="testuser",
+        password_hash=password_handler.hash_password("SecurePass123!@#"),
+        roles=["MEMBER"],
+        permissions=["tasks.read"],
+        is_active=True
+    )
+    await repository.create_user(user)
+    await repository.store_password_reset_token(
+        user_id=user.id,
+        tenant_id=test_tenant_id,
+        token_hash=_hash_reset_token("reset-token"),
+        expires_at=get_utc_now() - timedelta(minutes=1)
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await ResetPasswordHandler().handle(
+            ResetPasswordCommand(token="reset-token", new_password="NewSecurePass456!@#"),
+            db_session
+        )
+    assert exc_info.value.status_code == 400
+
+    result = await db_session.execute(select(User.password_hash).where(User.id == user.id))
+    assert password_handler.verify_password("SecurePass123!@#", result.scalar_one()) is True
+
+
+@pytest.mark.asyncio
+@patch('app.auth.handlers.password_handler.check_compromised_password', new_callable=AsyncMock, return_value=False)
+@patch('app.auth.handlers.AuthRepository')
+async def test_password_reset_lost_claim_is_rejected(mock_repository_cls, mock_check_compromised, test_user_id, test_tenant_id):
+    """Test a token claimed by a concurrent reset between lookup and completion fails."""
+    db = object()
+    repository = AsyncMock(spec=AuthRepository)
+    repository.get_password_reset_token.return_value = {"user_id": test_user_id, "tenant_id": test_tenant_id}
+    repository.complete_password_reset.return_value = None
+    mock_repository_cls.return_value = repository
+
+    with pytest.raises(HTTPException) as exc_info:
+        await ResetPasswordHandler().handle(
+            ResetPasswordCommand(token="reset-token", new_password="NewSecurePass456!@#"),
+            db
+        )
+
+    assert exc_info.value.status_code == 400
+    token_hash, password_hash = repository.complete_password_reset.await_args.args
+    assert token_hash == _hash_reset_token("reset-token")
+    assert password_handler.verify_password("NewSecurePass456!@#", password_hash) is True
+
 
 @pytest.mark.asyncio
 async def test_cross_tenant_isolation_user_access(db_session):
@@ -521,3 +775,43 @@ async def test_password_hashing_and_verification():
     hash2 = password_handler.hash_password(password)
     assert password_hash != hash2
 
+
+
+@pytest.mark.asyncio
+async def test_migrate_role_masks_converts_array_columns(db_engine):
+    """Test the one-shot migration turns legacy role/permission arrays into masks."""
+    from sqlalchemy import text
+    from init_db import migrate_role_masks
+
+    user_id = uuid4()
+    async with db_engine.begin() as conn:
+        await conn.execute(text(
+            "ALTER TABLE users DROP COLUMN roles_mask, DROP COLUMN permissions_mask, "
+            "ADD COLUMN roles TEXT[] NOT NULL DEFAULT '{}', "
+            "ADD COLUMN permissions TEXT[] NOT NULL DEFAULT '{}'"
+        ))
+        await conn.execute(
+            text(
+                "INSERT INTO users (id, tenant_id, email, username, password_hash, roles, permissions, "
+                "mfa_enabled, is_active, email_verified) VALUES (:id, :tenant_id, 'a@example.com', 'a', 'x', "
+                "ARRAY['TENANT_ADMIN', 'MEMBER'], ARRAY['tasks.read', 'reports.view'], false, true, false)"
+            ),
+            {"id": user_id, "tenant_id": uuid4()}
+        )
+
+    assert await migrate_role_masks() is True
+
+    async with db_engine.connect() as conn:
+        row = (await conn.execute(
+            text("SELECT roles_mask, permissions_mask FROM users WHERE id = :id"), {"id": user_id}
+        )).one()
+        columns = (await conn.execute(text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_name = 'users' AND column_name IN ('roles', 'permissions')"
+        ))).all()
+
+    assert decode_mask(row.roles_mask, ROLE_BITS) == ["TENANT_ADMIN", "MEMBER"]
+    assert decode_mask(row.permissions_mask, PERMISSION_BITS) == ["tasks.read", "reports.view"]
+    assert columns == []
+    # Already converted: a second run is a no-op
+    assert await migrate_role_masks() is True
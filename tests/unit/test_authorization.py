@@ -8,6 +8,10 @@ from app.shared.security.authorization import (
     check_resource_access,
     require_permission,
     require_role,
+    encode_mask,
+    decode_mask,
+    ROLE_BITS,
+    PERMISSION_BITS,
     Role,
     Permission
 )
@@ -313,3 +317,23 @@ def test_permission_string_values():
     assert Permission.TENANT_CONFIGURE.value == "tenant.configure"
 
 
+
+
+def test_role_and_permission_mask_round_trip():
+    """Test roles and permissions survive bitmask encoding."""
+    roles = [Role.TENANT_ADMIN, Role.MEMBER]
+    permissions = ["tasks.read", "reports.view"]
+
+    roles_mask = encode_mask(roles, ROLE_BITS)
+    permissions_mask = encode_mask(permissions, PERMISSION_BITS)
+
+    assert decode_mask(roles_mask, ROLE_BITS) == ["TENANT_ADMIN", "MEMBER"]
+    assert decode_mask(permissions_mask, PERMISSION_BITS) == permissions
+    assert permissions_mask & PERMISSION_BITS[Permission.TASKS_READ]
+    assert not permissions_mask & PERMISSION_BITS[Permission.TASKS_DELETE]
+
+
+def test_encode_mask_rejects_unknown_values():
+    """Test encoding an unknown role raises ValueError."""
+    with pytest.raises(ValueError):
+        encode_mask(["NOT_A_ROLE"], ROLE_BITS)
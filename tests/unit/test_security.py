@@ -311,6 +311,22 @@ def test_password_hash_uses_argon2():
     assert hashed.startswith("$argon2id$")
 
 
+def test_password_needs_rehash_for_legacy_parameters():
+    """Test that hashes with outdated Argon2 parameters are flagged for rehash."""
+    from argon2 import PasswordHasher
+
+    legacy_hash = PasswordHasher(time_cost=3, memory_cost=65536, parallelism=4).hash("TestPassword123!")
+
+    assert password_handler.verify_password("TestPassword123!", legacy_hash) is True
+    assert password_handler.needs_rehash(legacy_hash) is True
+    assert password_handler.needs_rehash(password_handler.hash_password("TestPassword123!")) is False
+
+
+def test_password_verify_rejects_malformed_hash():
+    """Test that malformed hashes fail verification instead of raising."""
+    assert password_handler.verify_password("TestPassword123!", "not-a-hash") is False
+
+
 def test_jwt_different_tokens_for_same_user():
     """Test that creating multiple tokens for same user produces different tokens."""
     import time
@@ -364,3 +380,147 @@ def test_jwt_refresh_token_different_jti():
 
 
 
+
+
+def test_verify_totp_rfc6238_vectors():
+    """Test TOTP verification against RFC 6238 SHA-1 test vectors."""
+    import base64
+    from app.shared.security.totp import verify_totp
+
+    secret = base64.b32encode(b"12345678901234567890").decode()
+
+    assert verify_totp(secret, "287082", window=0, for_time=59) is True
+    assert verify_totp(secret, "081804", window=0, for_time=1111111109) is True
+    # Previous interval is accepted only inside the window
+    assert verify_totp(secret, "287082", window=1, for_time=89) is True
+    assert verify_totp(secret, "287082", window=0, for_time=89) is False
+    assert verify_totp(secret, "28708", window=1, for_time=59) is False
+
+
+@pytest.mark.asyncio
+async def test_check_compromised_password_coalesces_concurrent_lookups():
+    """Test concurrent checks sharing a SHA-1 prefix issue a single HIBP request."""
+    import asyncio
+    import hashlib
+    from unittest.mock import patch
+    from app.shared.security import password as password_module
+
+    password = "CoalescedPassword123!"
+    sha1_hash = hashlib.sha1(password.encode()).hexdigest().upper()
+    calls = []
+
+    async def fake_fetch(prefix):
+        calls.append(prefix)
+        await asyncio.sleep(0.01)
+        return frozenset({sha1_hash[5:]})
+
+    password_module._pwned_suffix_cache.pop(sha1_hash[:5], None)
+    with patch.object(password_module, "_fetch_pwned_suffixes", fake_fetch):
+        results = await asyncio.gather(
+            *(password_handler.check_compromised_password(password) for _ in range(5))
+        )
+
+    assert results == [True] * 5
+    assert calls == [sha1_hash[:5]]
+
+
+def test_decode_token_cached_reuses_successful_verification():
+    """Test verified payloads are cached and failed verifications are not."""
+    from unittest.mock import patch
+    from app.shared.security.jwt_cache import decode_token_cached, evict_token
+
+    token = jwt_handler.create_access_token(
+        user_id=uuid4(),
+        email="test@example.com",
+        tenant_id=uuid4(),
+        roles=["MEMBER"],
+        permissions=["tasks.read"]
+    )
+
+    first = decode_token_cached(token)
+    with patch.object(jwt_handler, "decode_token", side_effect=AssertionError("not cached")):
+        assert decode_token_cached(token) == first
+
+    evict_token(token)
+    with patch.object(jwt_handler, "decode_token", side_effect=JWTError("bad")) as decode:
+        with pytest.raises(JWTError):
+            decode_token_cached(token)
+        with pytest.raises(JWTError):
+            decode_token_cached(token)
+        assert decode.call_count == 2
+
+
+def test_decode_token_cached_payload_is_read_only():
+    """Test callers cannot alter the payload shared through the cache."""
+    from app.shared.security.jwt_cache import decode_token_cached
+
+    token = jwt_handler.create_access_token(
+        user_id=uuid4(),
+        email="test@example.com",
+        tenant_id=uuid4(),
+        roles=["MEMBER"],
+        permissions=["tasks.read"]
+    )
+
+    payload = decode_token_cached(token)
+    with pytest.raises(TypeError):
+        payload["roles"] = ["TENANT_ADMIN"]
+    with pytest.raises((TypeError, AttributeError)):
+        payload.pop("sub")
+    with pytest.raises(AttributeError):
+        payload["permissions"].append("users.manage")
+
+    assert decode_token_cached(token)["roles"] == ("MEMBER",)
+
+
+def test_authenticate_token_caches_parsed_principal():
+    """Test access tokens are parsed into a principal once and reused."""
+    from unittest.mock import patch
+    from app.shared.security import jwt_cache
+    from app.shared.security.jwt_cache import authenticate_token, evict_token
+
+    user_id = uuid4()
+    tenant_id = uuid4()
+    token = jwt_handler.create_access_token(
+        user_id=user_id,
+        email="test@example.com",
+        tenant_id=tenant_id,
+        roles=["MEMBER"],
+        permissions=["tasks.read"]
+    )
+
+    principal = authenticate_token(token)
+    assert principal.user_id == user_id
+    assert principal.tenant_id == tenant_id
+    assert principal.roles == frozenset({"MEMBER"})
+    assert principal.permissions == frozenset({"tasks.read"})
+    assert principal.department_id is None
+
+    with patch.object(jwt_cache, "decode_token_cached", side_effect=AssertionError("not cached")):
+        assert authenticate_token(token) is principal
+
+    evict_token(token)
+    with patch.object(jwt_cache, "decode_token_cached", side_effect=JWTError("revoked")):
+        with pytest.raises(JWTError):
+            authenticate_token(token)
+
+
+def test_parse_uuid_reuses_parsed_ids():
+    """Test repeated IDs return the same UUID object and invalid IDs still fail."""
+    from app.shared.context import parse_uuid
+
+    value = str(uuid4())
+    assert parse_uuid(value) is parse_uuid(value)
+    assert str(parse_uuid(value)) == value
+
+    with pytest.raises(ValueError):
+        parse_uuid("not-a-uuid")
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_counter_requires_redis_connection():
+    """Test the rate-limit counter fails loudly instead of calling an unregistered script."""
+    from app.shared.cache.redis_client import RedisClient
+
+    with pytest.raises(RuntimeError, match="Redis not connected"):
+        await RedisClient().incr_with_expiry("rate_limit:test", 60)
@@ -1,8 +1,11 @@
 """Unit tests for task management."""
 import pytest
+from fnmatch import fnmatchcase
+from unittest.mock import patch
 from uuid import uuid4
 from fastapi import HTTPException
-from app.task.domain.models import Task, TaskStatus, Priority
+from sqlalchemy import select
+from app.task.domain.models import Task, TaskStatus, Priority, AuditLogEntry
 from app.task.domain.aggregates import TaskAggregate
 from app.task.repository import TaskRepository
 from app.task.commands import (
@@ -13,14 +16,19 @@ from app.task.commands import (
     DeleteTaskCommand,
     AddTaskCommentCommand
 )
+from app.task.queries import GetTaskByIdQuery, GetUserTasksQuery
 from app.task.handlers import (
     CreateTaskHandler,
     UpdateTaskHandler,
     AssignTaskHandler,
     ChangeTaskStatusHandler,
     DeleteTaskHandler,
-    AddTaskCommentHandler
+    AddTaskCommentHandler,
+    GetUserTasksHandler
 )
+from app.shared.cache.redis_client import redis_client
+from app.shared.context import RequestContext, request_context
+from app.shared.cqrs.mediator import Mediator
 from app.shared.security.authorization import (
     check_permission,
     check_role,
@@ -422,6 +430,12 @@ async def test_change_task_status_handler(db_session, test_tenant_id, test_user_
 
     assert updated_task.status == TaskStatus.IN_PROGRESS
 
+    # Audit entry is committed with the status change
+    result = await db_session.execute(select(AuditLogEntry).where(AuditLogEntry.task_id == task.id))
+    audit_entry = result.scalar_one()
+    assert audit_entry.action == "status_changed"
+    assert audit_entry.changes == {"new_status": TaskStatus.IN_PROGRESS.value}
+
 
 @pytest.mark.asyncio
 async def test_delete_task_soft_delete(db_session, test_tenant_id, test_user_id):
@@ -684,3 +698,83 @@ async def test_task_version_increments():
     aggregate.update_details(title="Updated Title")
     assert task.version == 4
 
+
+
+@pytest.mark.asyncio
+async def test_frozen_mediator_dispatches_with_session_and_rejects_registration():
+    """Test that a frozen mediator passes extra arguments through and refuses new handlers."""
+    mediator = Mediator()
+
+    async def handle(command, db):
+        return command, db
+
+    mediator.register_command_handler(DeleteTaskCommand, handle)
+    mediator.freeze()
+
+    command = DeleteTaskCommand(task_id=uuid4(), tenant_id=uuid4(), user_id=uuid4())
+    session = object()
+    assert await mediator.send(command, session) == (command, session)
+
+    with pytest.raises(RuntimeError):
+        mediator.register_command_handler(AddTaskCommentCommand, handle)
+
+    with pytest.raises(ValueError):
+        await mediator.query(command, session)
+
+
+@pytest.mark.asyncio
+async def test_mediator_accepts_synchronous_handlers():
+    """Test that synchronous handlers are called without being awaited."""
+    mediator = Mediator()
+    mediator.register_query_handler(GetTaskByIdQuery, lambda query, db: (query.task_id, db))
+    mediator.freeze()
+
+    query = GetTaskByIdQuery(task_id=uuid4(), tenant_id=uuid4())
+    assert await mediator.query(query, "session") == (query.task_id, "session")
+
+
+@pytest.mark.asyncio
+async def test_task_write_invalidates_cached_task_list(db_session, test_tenant_id, test_user_id):
+    """Test creating a task drops the tenant's cached (here: empty) task list."""
+    store = {}
+
+    async def fake_get(key, default=None):
+        return store.get(key, default)
+
+    async def fake_set(key, value, ttl):
+        store[key] = value
+
+    async def fake_delete_pattern(pattern):
+        matched = [key for key in store if fnmatchcase(key, pattern)]
+        for key in matched:
+            del store[key]
+        return len(matched)
+
+    repository = TaskRepository(db_session)
+    list_handler = GetUserTasksHandler(repository)
+    query = GetUserTasksQuery(tenant_id=test_tenant_id, user_id=test_user_id)
+    context_token = request_context.set(RequestContext(tenant_id=test_tenant_id))
+    try:
+        with patch.object(redis_client, "batched_get", fake_get), \
+                patch.object(redis_client, "batched_set", fake_set), \
+                patch.object(redis_client, "delete_pattern", fake_delete_pattern):
+            assert (await list_handler.handle(query)).total == 0
+            assert len(store) == 1
+
+            await CreateTaskHandler(repository).handle(CreateTaskCommand(
+                tenant_id=test_tenant_id,
+                project_id=uuid4(),
+                title="Test Task",
+                description=None,
+                priority=Priority.HIGH,
+                assigned_to_user_id=None,
+                created_by_user_id=test_user_id,
+                due_date=None,
+                tags=[],
+                estimated_hours=None
+            ))
+            assert store == {}
+
+            assert (await list_handler.handle(query)).total == 1
+    finally:
+        request_context.reset(context_token)